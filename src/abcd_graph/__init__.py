@@ -21,7 +21,9 @@
 __all__ = [
     "ABCDGraph",
     "ABCDParams",
+    "generate_many",
 ]
 
+from abcd_graph.batch import generate_many
 from abcd_graph.graph import ABCDGraph
 from abcd_graph.params import ABCDParams
@@ -0,0 +1,232 @@
+# Copyright (c) 2024 Jordan Barrett & Aleksander Wojnarowicz
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+__all__ = [
+    "generate_many",
+    "generate_ensemble",
+    "agenerate_ensemble",
+    "stats_sink",
+    "NpzSink",
+]
+
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+from os import PathLike
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from abcd_graph.graph import ABCDGraph
+from abcd_graph.graph.core.build import VertexSequences
+from abcd_graph.graph.graph import Retain
+from abcd_graph.models import Model
+from abcd_graph.params import ABCDParams
+from abcd_graph.utils import seeded
+
+# Sinks run inside the worker process and must be picklable - module level functions or instances of such classes
+Sink = Callable[[ABCDGraph, int], Any]
+
+
+def stats_sink(graph: ABCDGraph, index: int) -> dict[str, Any]:
+    assert graph._graph is not None
+
+    return {
+        "index": index,
+        "number_of_nodes": graph.vcount,
+        "number_of_edges": graph._graph.num_edges,
+        "number_of_communities": graph._graph.num_communities,
+        "number_of_loops": graph._graph.num_loops,
+        "number_of_multi_edges": graph._graph.num_multi_edges,
+        "empirical_xi": graph._graph.empirical_xi,
+    }
+
+
+class NpzSink:
+    def __init__(
+        self,
+        directory: Union[str, "PathLike[str]"],
+        dtype: DTypeLike = np.int64,
+        symmetric: bool = True,
+    ) -> None:
+        self.directory = Path(directory)
+        self.dtype = dtype
+        self.symmetric = symmetric
+
+    def __call__(self, graph: ABCDGraph, index: int) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        path = self.directory / f"graph_{index}.npz"
+        graph.exporter.to_npz(path, dtype=self.dtype, symmetric=self.symmetric)
+
+        return str(path)
+
+
+Task = tuple[int, ABCDParams, Optional[Model], Optional[int], Sink, Optional[VertexSequences]]
+
+
+def _generate(task: Task) -> Any:
+    index, params, model, seed, sink, sequences = task
+
+    if seed is None:
+        return sink(_build_minimal(params, model, sequences), index)
+
+    with seeded(seed):
+        graph = _build_minimal(params, model, sequences)
+
+    return sink(graph, index)
+
+
+def _build_minimal(params: ABCDParams, model: Optional[Model], sequences: Optional[VertexSequences]) -> ABCDGraph:
+    # Only the sink's result leaves the worker, so the build-time structures are not needed
+    return ABCDGraph(params).build(model, retain="minimal", sequences=sequences)
+
+
+def generate_many(
+    params_iter: Iterable[ABCDParams],
+    workers: Optional[int] = None,
+    sink: Sink = stats_sink,
+    model: Optional[Model] = None,
+    seed: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunksize: int = 1,
+) -> Iterator[Any]:
+    """Build a graph for every `ABCDParams` in a pool of worker processes and yield the results of `sink`.
+
+    Every graph is passed to `sink(graph, index)` inside the worker, so only the sink's (small) result is sent back.
+    Results are yielded in the order of `params_iter`. With `seed`, graph `i` is built with seed `seed + i`, so the
+    results do not depend on which worker builds which graph. Pass an `executor` to reuse one pool across several
+    sweeps, otherwise a pool of `workers` processes is created for the call. Seeded builds must run in a
+    `ProcessPoolExecutor`, as threads share the global random state.
+    """
+    _check_seeded_executor(seed, executor)
+
+    tasks = (
+        (index, params, model, None if seed is None else seed + index, sink, None)
+        for index, params in enumerate(params_iter)
+    )
+
+    return _run(tasks, workers, executor, chunksize)
+
+
+def generate_ensemble(
+    params: ABCDParams,
+    replicates: int,
+    workers: Optional[int] = None,
+    sink: Sink = stats_sink,
+    model: Optional[Model] = None,
+    seed: Optional[int] = None,
+    resample: bool = False,
+    executor: Optional[Executor] = None,
+    chunksize: int = 1,
+) -> Iterator[Any]:
+    """Build `replicates` graphs with the same `params` and yield the results of `sink`, like `generate_many`.
+
+    By default the vertex-level phases (degrees, community sizes and the degree split) run once, in the calling
+    process, and every replicate only generates and rewires its edges. With `resample=True` every replicate samples
+    its own sequences. With `seed`, the sequences and every replicate are built with independent seeds derived from it,
+    and the global random state of the calling process is left untouched - like in `generate_many`, a passed
+    `executor` must then be a `ProcessPoolExecutor`.
+    """
+    if replicates < 1:
+        raise ValueError("replicates must be a positive integer")
+
+    _check_seeded_executor(seed, executor)
+
+    seeds: list[Optional[int]] = [None] * (replicates + 1)
+    if seed is not None:
+        seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(replicates + 1)]
+
+    sequences = None
+    if not resample:
+        sequences = _sample_sequences(params, seeds[0])
+
+    tasks = ((index, params, model, seeds[index + 1], sink, sequences) for index in range(replicates))
+
+    return _run(tasks, workers, executor, chunksize)
+
+
+async def agenerate_ensemble(
+    params: ABCDParams,
+    replicates: int,
+    model: Optional[Model] = None,
+    retain: Retain = "minimal",
+    resample: bool = False,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[ABCDGraph]:
+    """Build `replicates` graphs with `ABCDGraph.abuild` and yield them as they finish, like `generate_ensemble`.
+
+    All replicates are scheduled at once - the number of graphs built at the same time is bounded by `executor`.
+    Graphs still being built are cancelled when the iteration is stopped early.
+    """
+    if replicates < 1:
+        raise ValueError("replicates must be a positive integer")
+
+    sequences = None
+    if not resample:
+        sequences = await asyncio.get_running_loop().run_in_executor(executor, ABCDGraph(params).sample_sequences)
+
+    tasks = [
+        asyncio.ensure_future(ABCDGraph(params).abuild(model, retain=retain, sequences=sequences, executor=executor))
+        for _ in range(replicates)
+    ]
+
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _check_seeded_executor(seed: Optional[int], executor: Optional[Executor]) -> None:
+    # Seeded builds seed and restore the process-global random state, which concurrent builds in threads would mix up
+    if seed is not None and executor is not None and not isinstance(executor, ProcessPoolExecutor):
+        raise ValueError("Building with `seed` requires a `ProcessPoolExecutor` as `executor`")
+
+
+def _sample_sequences(params: ABCDParams, seed: Optional[int]) -> VertexSequences:
+    if seed is None:
+        return ABCDGraph(params).sample_sequences()
+
+    with seeded(seed):
+        return ABCDGraph(params).sample_sequences()
+
+
+def _run(tasks: Iterable[Task], workers: Optional[int], executor: Optional[Executor], chunksize: int) -> Iterator[Any]:
+    if executor is not None:
+        yield from executor.map(_generate, tasks, chunksize=chunksize)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_generate, tasks, chunksize=chunksize)
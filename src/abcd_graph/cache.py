@@ -0,0 +1,177 @@
+# Copyright (c) 2024 Jordan Barrett & Aleksander Wojnarowicz
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+__all__ = ["GraphCache"]
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+import numpy as np
+from numpy.typing import NDArray
+
+from abcd_graph.graph.core.abcd_objects import GraphImpl
+from abcd_graph.params import ABCDParams
+from abcd_graph.version import __version__
+
+# Every entry is a directory holding one `.npy` file per array and the build counters in `meta.json`
+ARRAY_NAMES = ("edges", "deg_b", "deg_c", "community_offsets", "community_ids")
+META_FILE = "meta.json"
+TMP_PREFIX = ".tmp-"
+
+
+def canonical_params(params: ABCDParams) -> dict[str, Any]:
+    return {name: value.tolist() if isinstance(value, np.ndarray) else value for name, value in asdict(params).items()}
+
+
+class GraphCache:
+    """On-disk cache of built graphs, keyed by the parameters, seed, model and library version.
+
+    Entries are loaded with memory mapping. With `max_entries` and/or `max_bytes` the least recently used entries are
+    evicted after every `save`.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(params: ABCDParams, seed: int, model_name: str) -> str:
+        canonical = {
+            "params": canonical_params(params),
+            "seed": seed,
+            "model": model_name,
+            "version": __version__,
+        }
+        return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key
+
+    def __contains__(self, key: str) -> bool:
+        return (self.path(key) / META_FILE).exists()
+
+    def save(self, key: str, graph: GraphImpl) -> Path:
+        arrays = graph.to_arrays()
+        meta = {"diagnostics": graph.diagnostics, "is_proper_abcd": graph.is_proper_abcd}
+
+        # Entries are written to a temporary directory and renamed, so readers never see a partial entry
+        tmp = self.directory / f"{TMP_PREFIX}{key}-{uuid.uuid4().hex}"
+        tmp.mkdir()
+        for name, array in arrays.items():
+            np.save(tmp / f"{name}.npy", array)
+        (tmp / META_FILE).write_text(json.dumps(meta))
+
+        try:
+            os.rename(tmp, self.path(key))
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self._evict(keep=key)
+
+        return self.path(key)
+
+    def load_arrays(self, key: str) -> Optional[tuple[dict[str, NDArray[Any]], dict[str, Any]]]:
+        path = self.path(key)
+
+        try:
+            arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in ARRAY_NAMES}
+            meta = json.loads((path / META_FILE).read_text())
+            # The modification time of the metadata file is the entry's last use
+            os.utime(path / META_FILE)
+        except FileNotFoundError:
+            # Not cached, or evicted in the meantime
+            return None
+
+        return arrays, meta
+
+    def load(self, key: str, params: ABCDParams) -> Optional[GraphImpl]:
+        loaded = self.load_arrays(key)
+        if loaded is None:
+            return None
+
+        arrays, meta = loaded
+        return GraphImpl.from_arrays(
+            params,
+            edges=arrays["edges"],
+            deg_b=arrays["deg_b"],
+            deg_c=arrays["deg_c"],
+            community_offsets=arrays["community_offsets"],
+            community_ids=arrays["community_ids"],
+            diagnostics=meta["diagnostics"],
+            is_proper_abcd=meta["is_proper_abcd"],
+        )
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.iterdir():
+            if path.name.startswith(TMP_PREFIX):
+                continue
+
+            try:
+                last_used = (path / META_FILE).stat().st_mtime
+                size = sum(file.stat().st_size for file in path.iterdir())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+            entries.append((last_used, size, path))
+
+        return sorted(entries)
+
+    def _evict(self, keep: str) -> None:
+        if self.max_entries is None and self.max_bytes is None:
+            return
+
+        entries = self._entries()
+        num_entries = len(entries)
+        total_bytes = sum(size for _, size, _ in entries)
+
+        # Least recently used entries first
+        for _, size, path in entries:
+            within_entries = self.max_entries is None or num_entries <= self.max_entries
+            within_bytes = self.max_bytes is None or total_bytes <= self.max_bytes
+            if within_entries and within_bytes:
+                break
+
+            if path.name == keep:
+                continue
+
+            shutil.rmtree(path, ignore_errors=True)
+            num_entries -= 1
+            total_bytes -= size
@@ -18,7 +18,21 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Optional
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+)
+from operator import (
+    attrgetter,
+    methodcaller,
+)
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Sequence,
+)
 
 import numpy as np
 from numpy.typing import NDArray
@@ -28,70 +42,142 @@ from abcd_graph.callbacks.abstract import (
     BuildContext,
 )
 from abcd_graph.exporter import GraphExporter
-from abcd_graph.graph.core.abcd_objects import (
-    Community,
-    GraphImpl,
+from abcd_graph.graph.core.abcd_objects import GraphImpl
+from abcd_graph.graph.core.abcd_objects.graph_impl import SparseXiMatrix
+
+# `attrgetter` and `methodcaller` objects are picklable, so they can be submitted to process pools as well
+PROPERTIES: dict[str, Callable[[GraphImpl], Any]] = {
+    "degree_sequence": attrgetter("degree_sequence"),
+    "degree_array": methodcaller("degree_array"),
+    "xi_matrix": attrgetter("xi_matrix"),
+    "sparse_xi_matrix": attrgetter("sparse_xi_matrix"),
+    "expected_degree_cdf": attrgetter("expected_degree_cdf"),
+    "actual_degree_cdf": attrgetter("actual_degree_cdf"),
+    "expected_community_cdf": attrgetter("expected_community_cdf"),
+    "actual_community_cdf": attrgetter("actual_community_cdf"),
+}
+
+DEFAULT_BACKGROUND_PROPERTIES: tuple[str, ...] = (
+    "degree_array",
+    "degree_sequence",
+    "actual_degree_cdf",
+    "expected_degree_cdf",
+    "actual_community_cdf",
+    "expected_community_cdf",
+    "xi_matrix",
 )
 
 
 class PropertyCollector(ABCDCallback):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        background: bool = False,
+        executor: Optional[Executor] = None,
+        properties: Sequence[str] = DEFAULT_BACKGROUND_PROPERTIES,
+    ) -> None:
+        unknown = set(properties) - PROPERTIES.keys()
+        if unknown:
+            raise ValueError(f"Unknown properties: {sorted(unknown)}")
+
+        self._background = background
+        self._executor = executor
+        self._background_properties = tuple(properties)
+
         self._graph: Optional[GraphImpl] = None
 
-        self._communities: list[Community] = []
+        # A missing key means "not computed", so empty results are never recomputed
+        self._results: dict[str, Any] = {}
 
-        self._degree_sequence: dict[int, int] = {}
+        self._future: Optional[Future[dict[str, tuple[bool, Any]]]] = None
 
-        self._xi_matrix: Optional[NDArray[np.float64]] = None
+    def after_build(self, graph: GraphImpl, context: BuildContext, exporter: GraphExporter) -> None:
+        self._graph = graph
+        self._results = {}
+        self._future = None
 
-        self._expected_degree_cdf: dict[int, float] = {}
+        if self._background:
+            self._start_background_computation(graph)
 
-        self._actual_degree_cdf: dict[int, float] = {}
+    def _start_background_computation(self, graph: GraphImpl) -> None:
+        executor = self._executor or ThreadPoolExecutor(thread_name_prefix="abcd-property-collector")
 
-        self._expected_community_cdf: dict[int, float] = {}
+        # A single task, so that a process pool receives the graph only once
+        self._future = executor.submit(_compute_properties, graph, self._background_properties)
 
-        self._actual_community_cdf: dict[int, float] = {}
+        if self._executor is None:
+            # Already submitted tasks still run to completion, only the worker threads are released afterwards
+            executor.shutdown(wait=False)
 
-    def after_build(self, graph: GraphImpl, context: BuildContext, exporter: GraphExporter) -> None:
-        self._graph = graph
+    def is_ready(self, name: str) -> bool:
+        if name not in PROPERTIES:
+            raise ValueError(f"Unknown property: {name}")
+
+        return name in self._results or (self._is_scheduled(name) and self._future.done())  # type: ignore[union-attr]
+
+    def _is_scheduled(self, name: str) -> bool:
+        return self._future is not None and name in self._background_properties
+
+    def _get(self, name: str) -> Any:
+        if name not in self._results:
+            if self._is_scheduled(name):
+                computed, value = self._future.result()[name]  # type: ignore[union-attr]
+                if not computed:
+                    raise value
+            else:
+                value = PROPERTIES[name](self._graph)  # type: ignore[arg-type]
+
+            self._results[name] = value
+
+        return self._results[name]
 
     @property
     def degree_sequence(self) -> dict[int, int]:
-        if not self._degree_sequence:
-            self._degree_sequence = self._graph.degree_sequence  # type: ignore[union-attr]
+        degree_sequence: dict[int, int] = self._get("degree_sequence")
+        return degree_sequence
 
-        return self._degree_sequence
+    @property
+    def degree_array(self) -> NDArray[np.int64]:
+        degree_array: NDArray[np.int64] = self._get("degree_array")
+        return degree_array
 
     @property
     def xi_matrix(self) -> NDArray[np.float64]:
-        if self._xi_matrix is None:
-            self._xi_matrix = self._graph.xi_matrix  # type: ignore[union-attr]
-        return self._xi_matrix
+        xi_matrix: NDArray[np.float64] = self._get("xi_matrix")
+        return xi_matrix
 
     @property
-    def expected_degree_cdf(self) -> dict[int, float]:
-        if not self._expected_degree_cdf:
-            self._expected_degree_cdf = self._graph.expected_degree_cdf  # type: ignore[union-attr]
+    def sparse_xi_matrix(self) -> SparseXiMatrix:
+        sparse_xi_matrix: SparseXiMatrix = self._get("sparse_xi_matrix")
+        return sparse_xi_matrix
 
-        return self._expected_degree_cdf
+    @property
+    def expected_degree_cdf(self) -> dict[int, float]:
+        expected_degree_cdf: dict[int, float] = self._get("expected_degree_cdf")
+        return expected_degree_cdf
 
     @property
     def actual_degree_cdf(self) -> dict[int, float]:
-        if not self._actual_degree_cdf:
-            self._actual_degree_cdf = self._graph.actual_degree_cdf  # type: ignore[union-attr]
-
-        return self._actual_degree_cdf
+        actual_degree_cdf: dict[int, float] = self._get("actual_degree_cdf")
+        return actual_degree_cdf
 
     @property
     def expected_community_cdf(self) -> dict[int, float]:
-        if not self._expected_community_cdf:
-            self._expected_community_cdf = self._graph.expected_community_cdf  # type: ignore[union-attr]
-
-        return self._expected_community_cdf
+        expected_community_cdf: dict[int, float] = self._get("expected_community_cdf")
+        return expected_community_cdf
 
     @property
     def actual_community_cdf(self) -> dict[int, float]:
-        if not self._actual_community_cdf:
-            self._actual_community_cdf = self._graph.actual_community_cdf  # type: ignore[union-attr]
+        actual_community_cdf: dict[int, float] = self._get("actual_community_cdf")
+        return actual_community_cdf
+
+
+def _compute_properties(graph: GraphImpl, names: tuple[str, ...]) -> dict[str, tuple[bool, Any]]:
+    # A failing property does not stop the others, its exception is raised when it is read
+    results: dict[str, tuple[bool, Any]] = {}
+    for name in names:
+        try:
+            results[name] = (True, PROPERTIES[name](graph))
+        except Exception as e:
+            results[name] = (False, e)
 
-        return self._actual_community_cdf
+    return results
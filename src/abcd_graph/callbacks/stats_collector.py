@@ -20,7 +20,13 @@
 
 __all__ = ["StatsCollector"]
 
-from typing import Any
+import time
+from typing import (
+    Any,
+    Literal,
+)
+
+from typing_extensions import TypeAlias
 
 from abcd_graph.callbacks.abstract import (
     ABCDCallback,
@@ -29,9 +35,15 @@ from abcd_graph.callbacks.abstract import (
 from abcd_graph.exporter import GraphExporter
 from abcd_graph.graph.core.abcd_objects.graph_impl import GraphImpl
 
+StatsLevel: TypeAlias = Literal["basic", "full"]
+
 
 class StatsCollector(ABCDCallback):
-    def __init__(self) -> None:
+    def __init__(self, level: StatsLevel = "full") -> None:
+        if level not in ("basic", "full"):
+            raise ValueError("level must be either 'basic' or 'full'")
+
+        self._level = level
         self._statistics: dict[str, Any] = {}
 
     @property
@@ -52,22 +64,28 @@ class StatsCollector(ABCDCallback):
     def after_build(self, graph: "GraphImpl", context: BuildContext, exporter: GraphExporter) -> None:
         _ = exporter
 
+        collection_start = time.perf_counter()
+
         self.log_statistic("start_time", context.start_time)
         self.log_statistic("end_time", context.end_time)
         self.log_statistic("time_to_build", context.raw_build_time)
 
-        self.log_statistic("number_of_edges", len(graph.edges))
+        # Counters gathered during the build - no pass over the edges or vertices needed
+        self.log_statistic("number_of_edges", graph.num_edges)
         self.log_statistic("number_of_communities", graph.num_communities)
-        self.log_statistic("expected_average_degree", graph.expected_average_degree)
-        self.log_statistic("actual_average_degree", graph.average_degree)
-        self.log_statistic("expected_average_community_size", graph.expected_average_community_size)
-        self.log_statistic("actual_average_community_size", graph.actual_average_community_size)
         self.log_statistic("number_of_loops", graph.num_loops)
         self.log_statistic("number_of_multi_edges", graph.num_multi_edges)
-
         self.log_statistic("empirical_xi", get_empirical_xi(graph))
 
+        if self._level == "full":
+            # Single vectorized pass over the degree vectors, expected values are memoized per distribution
+            self.log_statistic("expected_average_degree", graph.expected_average_degree)
+            self.log_statistic("actual_average_degree", graph.average_degree)
+            self.log_statistic("expected_average_community_size", graph.expected_average_community_size)
+            self.log_statistic("actual_average_community_size", graph.actual_average_community_size)
+
+        self.log_statistic("time_to_collect_statistics", time.perf_counter() - collection_start)
+
 
 def get_empirical_xi(graph: GraphImpl) -> float:
-    num_community_edges = sum(len(community.edges) for community in graph.communities)
-    return 1 - (num_community_edges / len(graph.edges))
+    return graph.empirical_xi
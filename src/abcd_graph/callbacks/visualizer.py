@@ -20,6 +20,8 @@
 
 from typing import Optional
 
+import numpy as np
+
 from abcd_graph.callbacks.abstract import (
     ABCDCallback,
     BuildContext,
@@ -29,10 +31,15 @@ from abcd_graph.graph.core.abcd_objects import (
     Community,
     GraphImpl,
 )
-from abcd_graph.graph.core.utils import get_community_color_map
+from abcd_graph.graph.core.utils import (
+    get_community_color_map,
+    stratified_sample,
+)
 from abcd_graph.models import Model
 from abcd_graph.utils import require
 
+MAX_DRAWN_VERTICES: int = 100
+
 
 class Visualizer(ABCDCallback):
     def __init__(self) -> None:
@@ -49,18 +56,13 @@ class Visualizer(ABCDCallback):
         self._graph = graph
 
     @require("matplotlib")
-    def draw_community_cdf(self) -> None:
+    def draw_community_cdf(self, bins: Optional[int] = None) -> None:
         import matplotlib.pyplot as plt  # type: ignore[import]
 
         assert self._graph is not None
 
-        actual_cdf = self._graph.actual_community_cdf
-        expected_cdf = self._graph.expected_community_cdf
-
-        x_actual = list(actual_cdf.keys())
-        x_expected = list(expected_cdf.keys())
-        y_actual = list(actual_cdf.values())
-        y_expected = list(expected_cdf.values())
+        x_actual, y_actual = self._graph.actual_community_cdf_arrays(bins=bins)
+        x_expected, y_expected = self._graph.expected_community_cdf_arrays()
 
         plt.plot(x_actual, y_actual, label="Actual")
         plt.plot(x_expected, y_expected, label="Expected")
@@ -72,18 +74,13 @@ class Visualizer(ABCDCallback):
         plt.show()
 
     @require("matplotlib")
-    def draw_degree_cdf(self) -> None:
+    def draw_degree_cdf(self, bins: Optional[int] = None) -> None:
         import matplotlib.pyplot as plt
 
         assert self._graph is not None
 
-        actual_cdf = self._graph.actual_degree_cdf
-        expected_cdf = self._graph.expected_degree_cdf
-
-        x_actual = list(actual_cdf.keys())
-        x_expected = list(expected_cdf.keys())
-        y_actual = list(actual_cdf.values())
-        y_expected = list(expected_cdf.values())
+        x_actual, y_actual = self._graph.actual_degree_cdf_arrays(bins=bins)
+        x_expected, y_expected = self._graph.expected_degree_cdf_arrays()
 
         plt.plot(x_actual, y_actual, label="Actual")
         plt.plot(x_expected, y_expected, label="Expected")
@@ -96,10 +93,13 @@ class Visualizer(ABCDCallback):
 
     @require("networkx")
     @require("matplotlib")
-    def draw_communities(self) -> None:
+    def draw_communities(self, sample_size: Optional[int] = None) -> None:
         assert self._graph is not None
-        if len(self._graph.deg_b) > 100:
-            raise ValueError("Drawing communities is only supported for graphs with at most 100 vertices")
+        if sample_size is None and len(self._graph.deg_b) > MAX_DRAWN_VERTICES:
+            raise ValueError(
+                f"Drawing communities is only supported for graphs with at most {MAX_DRAWN_VERTICES} vertices. "
+                "Pass `sample_size` to draw a subgraph induced by a stratified sample of vertices instead."
+            )
 
         if self._model_used is not None and self._model_used.__name__ != "configuration_model":
             raise NotImplementedError("Drawing communities is only supported for the configuration model")
@@ -107,11 +107,77 @@ class Visualizer(ABCDCallback):
         import networkx as nx  # type: ignore[import]
         from matplotlib import pyplot as plt
 
-        assert self._exporter is not None
+        if sample_size is None:
+            assert self._exporter is not None
+
+            nx_g = self._exporter.to_networkx()
+
+            color_map = get_community_color_map(communities=self._communities)
+
+            nx.draw(nx_g, node_color=color_map, with_labels=True, font_weight="bold")
+            plt.show()
+            return
+
+        vertices = stratified_sample(self._graph.community_stats.offsets, sample_size)
+
+        edges = self._graph.edges_array
+        induced_edges = edges[np.isin(edges, vertices).all(axis=1)]
+
+        nx_g = nx.Graph()
+        nx_g.add_nodes_from(vertices.tolist())
+        nx_g.add_edges_from(induced_edges.tolist())
+
+        community_index = self._graph.community_index[vertices]
+
+        nx.draw(
+            nx_g,
+            nodelist=vertices.tolist(),
+            node_color=plt.cm.tab20(community_index % 20),
+            node_size=30,
+            with_labels=len(vertices) <= MAX_DRAWN_VERTICES,
+        )
+        plt.title(f"Subgraph induced by {len(vertices)} sampled vertices")
+        plt.show()
+
+    @require("matplotlib")
+    def draw_community_graph(self, min_weight: int = 1) -> None:
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection  # type: ignore[import]
+
+        assert self._graph is not None
+
+        stats = self._graph.community_stats
+        rows, cols, counts = self._graph.community_edge_counts()
+
+        # Communities are placed on a circle, so the layout costs O(C) regardless of the number of edges
+        angles = np.linspace(0, 2 * np.pi, len(stats), endpoint=False)
+        positions = np.column_stack([np.cos(angles), np.sin(angles)])
+
+        drawn = (rows != cols) & (counts >= min_weight)
+        weights = counts[drawn]
+
+        _, ax = plt.subplots()
+
+        if weights.size > 0:
+            segments = np.stack([positions[rows[drawn]], positions[cols[drawn]]], axis=1)
+            ax.add_collection(
+                LineCollection(list(segments), linewidths=0.5 + 4.5 * weights / weights.max(), alpha=0.3, color="gray")
+            )
 
-        nx_g = self._exporter.to_networkx()
+        ax.scatter(
+            positions[:, 0],
+            positions[:, 1],
+            s=20 + 480 * stats.volumes / stats.volumes.max(),
+            c=np.arange(len(stats)) % 20,
+            cmap="tab20",
+            zorder=2,
+        )
 
-        color_map = get_community_color_map(communities=self._communities)
+        if len(stats) <= MAX_DRAWN_VERTICES:
+            for (x, y), community_id in zip(positions, stats.community_ids.tolist()):
+                ax.annotate(str(community_id), (x, y), ha="center", va="center", fontsize=8)
 
-        nx.draw(nx_g, node_color=color_map, with_labels=True, font_weight="bold")
+        ax.set_aspect("equal")
+        ax.axis("off")
+        ax.set_title("Community graph")
         plt.show()
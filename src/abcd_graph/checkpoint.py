@@ -0,0 +1,150 @@
+# Copyright (c) 2024 Jordan Barrett & Aleksander Wojnarowicz
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+__all__ = ["Checkpoint"]
+
+import json
+import os
+import random
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Union,
+)
+
+import numpy as np
+from numpy.typing import NDArray
+
+from abcd_graph.cache import canonical_params
+from abcd_graph.params import ABCDParams
+from abcd_graph.version import __version__
+
+PHASES = (
+    "degrees",
+    "community_sizes",
+    "assignment",
+    "split",
+    "outliers",
+    "community_edges",
+    "background_edges",
+    "rewiring",
+)
+MANIFEST_FILE = "manifest.json"
+
+Arrays = dict[str, NDArray[Any]]
+
+
+class Checkpoint:
+    """Phase-by-phase snapshot of a build, kept in `directory`.
+
+    Every completed phase writes its new arrays to `<phase>.npz` and records itself in `manifest.json` together with the
+    state of both random number generators. With `resume=True` an existing manifest is loaded instead of discarded,
+    and it must have been written for the same parameters, model and library version.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        params: ABCDParams,
+        model_name: str,
+        resume: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._identity = {"params": canonical_params(params), "model": model_name, "version": __version__}
+        self._completed: dict[str, dict[str, Any]] = {}
+        self._random_state: Optional[dict[str, Any]] = None
+
+        manifest_path = self.directory / MANIFEST_FILE
+        if resume and manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            if manifest["identity"] != json.loads(json.dumps(self._identity)):
+                raise ValueError(
+                    f"Checkpoint in {self.directory} was written for different parameters, model or library version"
+                )
+            self._completed = manifest["completed"]
+            self._random_state = manifest["random_state"]
+        else:
+            manifest_path.unlink(missing_ok=True)
+
+    @property
+    def completed(self) -> list[str]:
+        return list(self._completed)
+
+    def is_completed(self, phase: str) -> bool:
+        return phase in self._completed
+
+    def arrays(self, phase: str) -> Arrays:
+        with np.load(self.directory / f"{phase}.npz") as data:
+            return {name: data[name] for name in data.files}
+
+    def meta(self, phase: str) -> dict[str, Any]:
+        return dict(self._completed[phase])
+
+    def restore_random_state(self) -> None:
+        # Continues the random streams from where the last completed phase left them
+        if self._random_state is None:
+            return
+
+        version, internal_state, gauss_next = self._random_state["random"]
+        random.setstate((version, tuple(internal_state), gauss_next))
+
+        name, keys, pos, has_gauss, cached_gaussian = self._random_state["numpy"]
+        np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+
+    def save(self, phase: str, arrays: Arrays, meta: Optional[dict[str, Any]] = None) -> None:
+        if phase not in PHASES:
+            raise ValueError(f"Unknown build phase: {phase}")
+
+        # Written under a temporary name first, so a crash never leaves a truncated phase behind
+        tmp_path = self.directory / f".tmp-{phase}.npz"
+        with open(tmp_path, "wb") as file:
+            np.savez(file, **arrays)  # type: ignore[arg-type]
+        os.replace(tmp_path, self.directory / f"{phase}.npz")
+
+        self._completed[phase] = dict(meta or {})
+
+        np_state = np.random.get_state()
+        self._random_state = {
+            "random": random.getstate(),
+            "numpy": [np_state[0], np_state[1].tolist(), *np_state[2:]],  # type: ignore[index]
+        }
+
+        manifest = {"identity": self._identity, "completed": self._completed, "random_state": self._random_state}
+        tmp_manifest = self.directory / f".tmp-{MANIFEST_FILE}"
+        tmp_manifest.write_text(json.dumps(manifest))
+        os.replace(tmp_manifest, self.directory / MANIFEST_FILE)
+
+
+def run_phase(checkpoint: Optional[Checkpoint], phase: str, run: Callable[[], Arrays]) -> Arrays:
+    if checkpoint is None:
+        return run()
+
+    if checkpoint.is_completed(phase):
+        return checkpoint.arrays(phase)
+
+    arrays = run()
+    checkpoint.save(phase, arrays)
+
+    return arrays
@@ -18,10 +18,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from os import PathLike
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Optional,
+    Union,
+)
 
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import (
+    DTypeLike,
+    NDArray,
+)
 
 from abcd_graph.graph.core.abcd_objects import GraphImpl
 from abcd_graph.graph.core.exceptions import MalformedGraphException
@@ -33,6 +43,15 @@ if TYPE_CHECKING:  # pragma: no cover
     from scipy.sparse import csr_matrix  # type: ignore[import]
 
 
+@dataclass
+class CommunityGraph:
+    community_ids: NDArray[np.int32]
+    # Symmetric C x C counts of edges between distinct communities, rows and columns follow `community_ids`
+    edge_counts: Union[NDArray[np.int64], "csr_matrix"]  # type: ignore[no-any-unimported]
+    internal_edges: NDArray[np.int64]
+    volumes: NDArray[np.int64]
+
+
 class GraphExporter:
     def __init__(self, graph: GraphImpl) -> None:
         self._graph: GraphImpl = graph
@@ -58,6 +77,86 @@ class GraphExporter:
         assert self._graph is not None
         return csr_matrix(self.to_adjacency_matrix())
 
+    def to_edge_index(self, dtype: DTypeLike = np.int64, symmetric: bool = True) -> NDArray[np.integer]:
+        edges = self._graph.edges_array
+        num_edges = edges.shape[0]
+
+        edge_index: NDArray[np.integer] = np.empty((2, 2 * num_edges if symmetric else num_edges), dtype=dtype)
+        edge_index[:, :num_edges] = edges.T
+
+        if symmetric:
+            edge_index[0, num_edges:] = edges[:, 1]
+            edge_index[1, num_edges:] = edges[:, 0]
+
+        return edge_index
+
+    def to_labels(self, dtype: DTypeLike = np.int64) -> NDArray[np.integer]:
+        labels: NDArray[np.integer] = self._graph.membership.astype(dtype, copy=False)
+        return labels
+
+    def to_node_splits(
+        self,
+        fractions: dict[str, float],
+        seed: Union[int, np.random.Generator, None] = None,
+    ) -> dict[str, NDArray[np.int64]]:
+        if any(fraction < 0 for fraction in fractions.values()) or sum(fractions.values()) > 1:
+            raise ValueError("Split fractions must be non-negative and sum up to at most 1")
+
+        vcount = self._graph._params.vcount
+        # Without a seed the global numpy state is used, e.g. as seeded by `abcd_graph.utils.seed`
+        permutation = np.random.permutation(vcount) if seed is None else np.random.default_rng(seed).permutation(vcount)
+        bounds = np.floor(np.cumsum([0.0, *fractions.values()]) * vcount).astype(np.int64)
+
+        return {name: np.sort(permutation[start:stop]) for name, start, stop in zip(fractions, bounds, bounds[1:])}
+
+    def to_npz(
+        self,
+        file: Union[str, "PathLike[str]", IO[bytes]],
+        dtype: DTypeLike = np.int64,
+        symmetric: bool = True,
+        splits: Optional[dict[str, float]] = None,
+        seed: Union[int, np.random.Generator, None] = None,
+    ) -> None:
+        arrays: dict[str, NDArray[np.integer]] = {
+            "edge_index": self.to_edge_index(dtype=dtype, symmetric=symmetric),
+            "labels": self.to_labels(dtype=dtype),
+        }
+
+        if splits:
+            arrays.update({f"{name}_index": index for name, index in self.to_node_splits(splits, seed=seed).items()})
+
+        np.savez(file, **arrays)  # type: ignore[arg-type]
+
+    @require("scipy")
+    def to_community_graph(self, sparse: bool = True) -> CommunityGraph:
+        rows, cols, counts = self._graph.community_edge_counts()
+        stats = self._graph.community_stats
+        num_communities = len(stats)
+
+        is_internal = rows == cols
+        internal_edges = np.zeros(num_communities, dtype=np.int64)
+        internal_edges[rows[is_internal]] = counts[is_internal]
+
+        rows, cols, counts = rows[~is_internal], cols[~is_internal], counts[~is_internal]
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        counts = np.concatenate([counts, counts])
+
+        edge_counts: Union[NDArray[np.int64], "csr_matrix"]  # type: ignore[no-any-unimported]
+        if sparse:
+            from scipy.sparse import csr_matrix
+
+            edge_counts = csr_matrix((counts, (rows, cols)), shape=(num_communities, num_communities))
+        else:
+            edge_counts = np.zeros((num_communities, num_communities), dtype=np.int64)
+            edge_counts[rows, cols] = counts
+
+        return CommunityGraph(
+            community_ids=stats.community_ids,
+            edge_counts=edge_counts,
+            internal_edges=internal_edges,
+            volumes=stats.volumes,
+        )
+
     @require("igraph")
     def to_igraph(self) -> "IGraph":  # type: ignore[no-any-unimported]
         import igraph
@@ -77,9 +176,10 @@ class GraphExporter:
         graph.add_nodes_from(range(self._graph._params.vcount))
         graph.add_edges_from(self._graph.edges)
 
-        m_list = self._graph.membership_list
-
-        for node in graph.nodes:
-            graph.nodes[node]["ground_truth_community"] = m_list[node]
+        nx.set_node_attributes(
+            graph,
+            dict(enumerate(self._graph.membership_list)),
+            name="ground_truth_community",
+        )
 
         return graph
@@ -1,21 +1,72 @@
+from typing import (
+    Iterator,
+    Sequence,
+    Union,
+    overload,
+)
+
+from abcd_graph.graph.core.abcd_objects.community_stats import CommunityStats
+
+
 class ABCDCommunity:
-    def __init__(
-        self,
-        community_id: int,
-        vertices: list[int],
-        average_degree: float,
-        degree_sequence: dict[int, int],
-        empirical_xi: float,
-    ) -> None:
-        self._community_id = community_id
-        self.vertices = vertices
-        self.average_degree = average_degree
-        self.degree_sequence = degree_sequence
-        self.empirical_xi = empirical_xi
+    __slots__ = ("_stats", "_index")
+
+    def __init__(self, stats: CommunityStats, index: int) -> None:
+        self._stats = stats
+        self._index = index
 
     @property
     def community_id(self) -> int:
-        return self._community_id
+        return int(self._stats.community_ids[self._index])
+
+    @property
+    def vertices(self) -> range:
+        return self._stats.vertices(self._index)
+
+    @property
+    def average_degree(self) -> float:
+        return float(self._stats.average_degrees[self._index])
+
+    @property
+    def degree_sequence(self) -> dict[int, int]:
+        vertices = self.vertices
+        return dict(zip(vertices, self._stats.degrees[vertices.start : vertices.stop].tolist()))  # noqa: E203
+
+    @property
+    def empirical_xi(self) -> float:
+        return float(self._stats.empirical_xis[self._index])
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"ABCDCommunityObj(id={self.community_id}, vertices={self.vertices[0]}-{self.vertices[-1]})"
+
+
+class ABCDCommunities(Sequence[ABCDCommunity]):
+    def __init__(self, stats: CommunityStats) -> None:
+        self._stats = stats
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    @overload
+    def __getitem__(self, index: int) -> ABCDCommunity: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ABCDCommunity]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ABCDCommunity, list[ABCDCommunity]]:
+        if isinstance(index, slice):
+            return [ABCDCommunity(self._stats, i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("community index out of range")
+
+        return ABCDCommunity(self._stats, index)
+
+    def __iter__(self) -> Iterator[ABCDCommunity]:
+        return (ABCDCommunity(self._stats, i) for i in range(len(self)))
 
     def __repr__(self) -> str:  # pragma: no cover
-        return f"ABCDCommunityObj(id={self._community_id}, vertices={self.vertices[0]}-{self.vertices[-1]})"
+        return f"ABCDCommunities({list(self)})"
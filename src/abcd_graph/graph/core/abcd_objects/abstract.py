@@ -1,5 +1,8 @@
 import abc
 
+import numpy as np
+from numpy.typing import NDArray
+
 from abcd_graph.graph.core.abcd_objects.edge import Edge
 
 
@@ -33,11 +36,16 @@ class AbstractCommunity(AbstractGraph):
                 self._adj_dict[edge] = 1
 
         self._edges = edges
+        self._num_generated_edges = len(edges)
 
     @property
     def edges(self) -> list[Edge]:
         return self._edges
 
+    @property
+    def num_generated_edges(self) -> int:
+        return self._num_generated_edges
+
     @property
     def adj_dict(self) -> dict[Edge, int]:
         return self._adj_dict
@@ -45,3 +53,21 @@ class AbstractCommunity(AbstractGraph):
     @property
     def diagnostics(self) -> dict[str, int]:
         return self._diagnostics
+
+    def release_edges(self) -> None:
+        self._edges = []
+        self._adj_dict = {}
+        self._bad_edges = []
+
+    def restore_edges(
+        self,
+        edges: NDArray[np.integer],
+        num_loops: int,
+        num_multi_edges: int,
+        num_generated_edges: int,
+    ) -> None:
+        # Restores a simple community from its edges - the generated edge list itself is not kept
+        self._adj_dict = {Edge(v1, v2): 1 for v1, v2 in edges.tolist()}
+        self._bad_edges = []
+        self._diagnostics = {"num_loops": num_loops, "num_multi_edges": num_multi_edges}
+        self._num_generated_edges = num_generated_edges
@@ -1,5 +1,8 @@
 __all__ = ["Community", "BackgroundGraph"]
 
+import numpy as np
+from numpy.typing import NDArray
+
 from abcd_graph.graph.core.abcd_objects.abstract import AbstractCommunity
 from abcd_graph.graph.core.abcd_objects.edge import Edge
 from abcd_graph.graph.core.abcd_objects.utils import (
@@ -14,9 +17,9 @@ class Community(AbstractCommunity):
     def __init__(
         self,
         edges: list[Edge],
-        vertices: list[int],
-        deg_b: dict[int, int],
-        deg_c: dict[int, int],
+        vertices: range,
+        deg_b: NDArray[np.int32],
+        deg_c: NDArray[np.int32],
         community_id: int,
     ) -> None:
         super().__init__(edges, community_id)
@@ -34,27 +37,30 @@ class Community(AbstractCommunity):
         return hash(self.community_id)
 
     @property
-    def vertices(self) -> list[int]:
+    def vertices(self) -> range:
         return self._vertices
 
     @property
     def average_degree(self) -> float:
-        return sum(self.degree_sequence.values()) / len(self.vertices)
+        return float(self._degrees().sum()) / len(self.vertices)
 
     @property
     def degree_sequence(self) -> dict[int, int]:
-        res = {}
-        for vert in self.vertices:
-            res[vert] = self._deg_c[vert] + self._deg_b[vert]
-        return res
+        return dict(zip(self.vertices, self._degrees().tolist()))
 
     @property
     def empirical_xi(self) -> float:
-        return sum(self._deg_b[i] for i in self.vertices) / (
-            sum(self._deg_b[i] + self._deg_c[i] for i in self.vertices)
-        )
+        return float(self._deg_b[self._slice].sum()) / float(self._degrees().sum())
+
+    @property
+    def _slice(self) -> slice:
+        return slice(self._vertices.start, self._vertices.stop)
 
-    def push_to_background(self, edges: list[Edge], deg_b: dict[int, int]) -> None:
+    def _degrees(self) -> NDArray[np.int64]:
+        degrees: NDArray[np.int64] = self._deg_b[self._slice].astype(np.int64) + self._deg_c[self._slice]
+        return degrees
+
+    def push_to_background(self, edges: list[Edge], deg_b: NDArray[np.int32]) -> None:
         for edge in edges:
             if edge.is_loop:
                 for i in range(self.adj_dict[edge]):
@@ -69,7 +75,7 @@ class Community(AbstractCommunity):
 
                     self._update_degree_sequences(edge, deg_b)
 
-    def _update_degree_sequences(self, edge: Edge, deg_b: dict[int, int]) -> None:
+    def _update_degree_sequences(self, edge: Edge, deg_b: NDArray[np.int32]) -> None:
         deg_b[edge.v1] += 1
         deg_b[edge.v2] += 1
         self._deg_c[edge.v1] -= 1
@@ -77,6 +83,11 @@ class Community(AbstractCommunity):
 
     def rewire_community(self) -> None:
         while len(self._bad_edges) > 0:
+            # A single distinct edge has nothing to be rewired with, so it is moved to the background right away
+            if len(self.adj_dict) < 2:
+                self.push_to_background(build_recycle_list(self.adj_dict), self._deg_b)
+                return
+
             for edge in self._bad_edges:
                 other_edge = choose_other_edge(self.adj_dict, edge)
                 rewire_edge(self.adj_dict, edge, other_edge)
@@ -0,0 +1,73 @@
+__all__ = ["CommunityStats", "count_community_pairs"]
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from abcd_graph.graph.core.constants import OUTLIER_COMMUNITY_ID
+
+
+@dataclass(frozen=True)
+class CommunityStats:
+    community_ids: NDArray[np.int32]
+    offsets: NDArray[np.int64]
+    degrees: NDArray[np.int64]
+    volumes: NDArray[np.int64]
+    xi_volumes: NDArray[np.int64]
+    average_degrees: NDArray[np.float64]
+    empirical_xis: NDArray[np.float64]
+
+    @classmethod
+    def from_degrees(
+        cls,
+        community_ids: NDArray[np.int32],
+        sizes: NDArray[np.int64],
+        deg_b: NDArray[np.integer],
+        deg_c: NDArray[np.integer],
+    ) -> "CommunityStats":
+        # Communities occupy contiguous vertex ranges, so per-community sums are segment reductions
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        degrees = deg_b.astype(np.int64) + deg_c
+
+        volumes = np.add.reduceat(degrees, offsets[:-1])
+        xi_volumes = np.add.reduceat(deg_b, offsets[:-1], dtype=np.int64)
+
+        return cls(
+            community_ids=community_ids,
+            offsets=offsets,
+            degrees=degrees,
+            volumes=volumes,
+            xi_volumes=xi_volumes,
+            average_degrees=volumes / sizes,
+            empirical_xis=xi_volumes / volumes,
+        )
+
+    def __len__(self) -> int:
+        return len(self.community_ids)
+
+    @property
+    def sizes(self) -> NDArray[np.int64]:
+        return np.diff(self.offsets)
+
+    @property
+    def is_outlier(self) -> NDArray[np.bool_]:
+        is_outlier: NDArray[np.bool_] = self.community_ids == OUTLIER_COMMUNITY_ID
+        return is_outlier
+
+    def vertices(self, index: int) -> range:
+        return range(int(self.offsets[index]), int(self.offsets[index + 1]))
+
+
+def count_community_pairs(
+    edges: NDArray[np.integer],
+    community_index: NDArray[np.integer],
+    num_communities: int,
+) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+    c1 = community_index[edges[:, 0]].astype(np.int64)
+    c2 = community_index[edges[:, 1]].astype(np.int64)
+
+    # Unordered pairs as flat keys into the upper triangle of a C x C matrix, sorted by row and then column
+    keys, counts = np.unique(np.minimum(c1, c2) * num_communities + np.maximum(c1, c2), return_counts=True)
+
+    return keys // num_communities, keys % num_communities, counts
@@ -1,8 +1,14 @@
-__all__ = ["GraphImpl"]
+__all__ = ["GraphImpl", "SparseXiMatrix"]
 
+from dataclasses import dataclass
+from itertools import chain
 from typing import (
+    TYPE_CHECKING,
+    Iterator,
     Optional,
+    Union,
     cast,
+    overload,
 )
 
 import numpy as np
@@ -14,14 +20,29 @@ from abcd_graph.graph.core.abcd_objects import (
     Edge,
 )
 from abcd_graph.graph.core.abcd_objects.abstract import AbstractGraph
+from abcd_graph.graph.core.abcd_objects.community_stats import (
+    CommunityStats,
+    count_community_pairs,
+)
 from abcd_graph.graph.core.abcd_objects.utils import (
     build_recycle_list,
     choose_other_edge,
     rewire_edge,
 )
+from abcd_graph.graph.core.build import BuildBudget
 from abcd_graph.graph.core.constants import OUTLIER_COMMUNITY_ID
+from abcd_graph.graph.core.utils import (
+    empirical_cdf,
+    powerlaw_cdf,
+    powerlaw_mean,
+    vertex_dtype,
+)
 from abcd_graph.models import Model
 from abcd_graph.params import ABCDParams
+from abcd_graph.utils import require
+
+if TYPE_CHECKING:  # pragma: no cover
+    from scipy.sparse import coo_matrix  # type: ignore[import]
 
 UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG = """Cannot compute {operation_name} because relevant parameters are `None`.
                 If you passed custom degree sequence to `ABCDParams()` you cannot use this property.
@@ -30,227 +51,362 @@ UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG = """Cannot compute {operation_name} b
 
 
 class GraphImpl(AbstractGraph):
-    def __init__(self, deg_b: dict[int, int], deg_c: dict[int, int], params: ABCDParams) -> None:
+    def __init__(self, deg_b: NDArray[np.int32], deg_c: NDArray[np.int32], params: ABCDParams) -> None:
         self.deg_b = deg_b
         self.deg_c = deg_c
 
         self._params = params
 
         self.communities: list[Community] = []
+        self.community_ids: NDArray[np.int32] = np.empty(0, dtype=np.int32)
+        self.community_offsets: NDArray[np.int64] = np.zeros(1, dtype=np.int64)
         self.background_graph: Optional[BackgroundGraph] = None
 
         self._adj_dict: dict[Edge, int] = {}
 
-    @property
-    def average_degree(self) -> float:
-        return (sum(self.deg_b.values()) + sum(self.deg_c.values())) / len(self.deg_b)
+        self._is_compact = False
+        self._is_proper_abcd: Optional[bool] = None
+
+        self._edges_array: Optional[NDArray[np.signedinteger]] = None
+        self._membership: Optional[NDArray[np.int32]] = None
+        self._degree_array: Optional[NDArray[np.int64]] = None
+        self._community_stats: Optional[CommunityStats] = None
+        self._diagnostics: Optional[dict[str, int]] = None
+        self._community_index: Optional[NDArray[np.int32]] = None
+        self._community_edge_counts: Optional[tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]] = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        params: ABCDParams,
+        *,
+        edges: NDArray[np.signedinteger],
+        deg_b: NDArray[np.int32],
+        deg_c: NDArray[np.int32],
+        community_offsets: NDArray[np.int64],
+        community_ids: NDArray[np.int32],
+        diagnostics: dict[str, int],
+        is_proper_abcd: bool,
+        membership: Optional[NDArray[np.int32]] = None,
+    ) -> "GraphImpl":
+        # Restores a compacted graph, the arrays are used as they are - e.g. memory mapped
+        graph = cls(deg_b, deg_c, params=params)
+
+        graph.community_offsets = community_offsets
+        graph.community_ids = community_ids
+        graph.communities = [
+            Community(edges=[], vertices=range(start, stop), deg_b=deg_b, deg_c=deg_c, community_id=community_id)
+            for community_id, start, stop in zip(
+                community_ids.tolist(),
+                community_offsets[:-1].tolist(),
+                community_offsets[1:].tolist(),
+            )
+        ]
+
+        graph._edges_array = edges
+        graph._membership = membership
+        graph._diagnostics = dict(diagnostics)
+        graph._is_proper_abcd = is_proper_abcd
+        graph._is_compact = True
+
+        return graph
+
+    def _invalidate_cache(self) -> None:
+        if self._is_compact:
+            raise RuntimeError("A compacted graph no longer holds the structures needed to modify it")
+
+        self._edges_array = None
+        self._membership = None
+        self._degree_array = None
+        self._community_stats = None
+        self._diagnostics = None
+        self._community_index = None
+        self._community_edge_counts = None
 
     @property
-    def expected_average_degree(self) -> float:
-        if not all([self._params.gamma, self._params.min_degree, self._params.max_degree]):
-            raise RuntimeError(
-                UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG.format(operation_name="expected average degree")
+    def community_stats(self) -> CommunityStats:
+        if self._community_stats is None:
+            self._community_stats = CommunityStats.from_degrees(
+                community_ids=self.community_ids,
+                sizes=np.diff(self.community_offsets),
+                deg_b=self.deg_b,
+                deg_c=self.deg_c,
             )
 
-        self._params.gamma = cast(float, self._params.gamma)
-        self._params.min_degree = cast(int, self._params.min_degree)
-        self._params.max_degree = cast(int, self._params.max_degree)
+        return self._community_stats
 
-        bottom: float = sum(
-            k ** (-self._params.gamma) for k in range(self._params.min_degree, self._params.max_degree + 1)
+    @property
+    def average_degree(self) -> float:
+        return float(self.community_stats.volumes.sum()) / len(self.deg_b)
+
+    def _degree_distribution(self, operation_name: str) -> tuple[float, int, int]:
+        if not all([self._params.gamma, self._params.min_degree, self._params.max_degree]):
+            raise RuntimeError(UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG.format(operation_name=operation_name))
+
+        return (
+            cast(float, self._params.gamma),
+            cast(int, self._params.min_degree),
+            cast(int, self._params.max_degree),
         )
-        top: float = sum(
-            k ** (1 - self._params.gamma) for k in range(self._params.min_degree, self._params.max_degree + 1)
+
+    def _community_size_distribution(self, operation_name: str) -> tuple[float, int, int]:
+        if not all([self._params.beta, self._params.min_community_size, self._params.max_community_size]):
+            raise RuntimeError(UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG.format(operation_name=operation_name))
+
+        return (
+            cast(float, self._params.beta),
+            cast(int, self._params.min_community_size),
+            cast(int, self._params.max_community_size),
         )
 
-        return top / bottom
+    @property
+    def expected_average_degree(self) -> float:
+        return powerlaw_mean(*self._degree_distribution("expected average degree"))
 
     @property
     def actual_degree_cdf(self) -> dict[int, float]:
         return self._calc_actual_degree_cdf()
 
     def _calc_actual_degree_cdf(self) -> dict[int, float]:
-        deg = {v: self.deg_b[v] + self.deg_c[v] for v in self.deg_b}
-        sorted_deg = sorted(list(deg.values()))
-        val = sorted_deg[0]
-        cdf = {val: 1 / self._params.vcount}
-        for d in sorted_deg[1:]:
-            new_val = d
-            if new_val == val:
-                cdf[new_val] += 1 / self._params.vcount
-            else:
-                cdf[new_val] = cdf[val] + 1 / self._params.vcount
-            val = new_val
-        return cdf
+        degrees, cdf = self.actual_degree_cdf_arrays()
+        return dict(zip(degrees.tolist(), cdf.tolist()))
+
+    def actual_degree_cdf_arrays(self, bins: Optional[int] = None) -> tuple[NDArray[np.number], NDArray[np.float64]]:
+        return empirical_cdf(self.community_stats.degrees, bins=bins)
 
     @property
     def expected_degree_cdf(self) -> dict[int, float]:
-        if not all([self._params.gamma, self._params.min_degree, self._params.max_degree]):
-            raise RuntimeError(UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG.format(operation_name="expected degree cdf"))
+        self._degree_distribution("expected degree cdf")
 
         return self._calc_expected_degree_cdf()
 
     def _calc_expected_degree_cdf(self) -> dict[int, float]:
-        self._params.gamma = cast(float, self._params.gamma)
-        self._params.min_degree = cast(int, self._params.min_degree)
-        self._params.max_degree = cast(int, self._params.max_degree)
-
-        cdf = {}
-        bottom = sum(k ** (-self._params.gamma) for k in range(self._params.min_degree, self._params.max_degree + 1))
+        degrees, cdf = self.expected_degree_cdf_arrays()
+        return dict(zip(degrees.tolist(), cdf.tolist()))
 
-        for d in range(self._params.min_degree, self._params.max_degree + 1):
-            cdf[d] = sum(k ** (-self._params.gamma) for k in range(self._params.min_degree, d + 1)) / bottom
-        return cdf
+    def expected_degree_cdf_arrays(self) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        return powerlaw_cdf(*self._degree_distribution("expected degree cdf"))
 
     @property
     def actual_average_community_size(self) -> float:
         return self._calc_actual_average_community_size()
 
     def _calc_actual_average_community_size(self) -> float:
-        volume = sum(
-            len(c.vertices) for c in self.communities if c.community_id != OUTLIER_COMMUNITY_ID
-        )  # Excluding outliers
-        num_communities = len([c for c in self.communities if c.community_id != OUTLIER_COMMUNITY_ID])
-        return volume / num_communities
+        stats = self.community_stats
+        return float(stats.sizes[~stats.is_outlier].mean())  # Excluding outliers
 
     @property
     def expected_average_community_size(self) -> float:
-        if not all([self._params.beta, self._params.min_community_size, self._params.max_community_size]):
-            raise RuntimeError(
-                UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG.format(operation_name="expected average community size")
-            )
+        self._community_size_distribution("expected average community size")
 
         return self._calc_expected_average_community_size()
 
     def _calc_expected_average_community_size(self) -> float:
-        self._params.beta = cast(float, self._params.beta)
-        self._params.min_community_size = cast(int, self._params.min_community_size)
-        self._params.max_community_size = cast(int, self._params.max_community_size)
-
-        bottom: float = sum(
-            k ** (-self._params.beta)
-            for k in range(self._params.min_community_size, self._params.max_community_size + 1)
-        )
-        top: float = sum(
-            k ** (1 - self._params.beta)
-            for k in range(self._params.min_community_size, self._params.max_community_size + 1)
-        )
-        return top / bottom
+        return powerlaw_mean(*self._community_size_distribution("expected average community size"))
 
     @property
     def actual_community_cdf(self) -> dict[int, float]:
         return self._calc_actual_community_cdf()
 
     def _calc_actual_community_cdf(self) -> dict[int, float]:
-        L = len([c for c in self.communities if c.community_id != OUTLIER_COMMUNITY_ID])  # Excluding outliers
-        sizes = {c: len(c.vertices) for c in self.communities if c.community_id != OUTLIER_COMMUNITY_ID}
-        sorted_sizes = sorted(list(sizes.values()))
-        val = sorted_sizes[0]
-        cdf = {val: 1 / L}
-        for s in sorted_sizes[1:]:
-            new_val = s
-            if new_val == val:
-                cdf[new_val] += 1 / L
-            else:
-                cdf[new_val] = cdf[val] + 1 / L
-            val = new_val
-        return cdf
+        sizes, cdf = self.actual_community_cdf_arrays()
+        return dict(zip(sizes.tolist(), cdf.tolist()))
+
+    def actual_community_cdf_arrays(self, bins: Optional[int] = None) -> tuple[NDArray[np.number], NDArray[np.float64]]:
+        stats = self.community_stats
+        return empirical_cdf(stats.sizes[~stats.is_outlier], bins=bins)  # Excluding outliers
 
     @property
     def expected_community_cdf(self) -> dict[int, float]:
-        if not all([self._params.beta, self._params.min_community_size, self._params.max_community_size]):
-            raise RuntimeError(
-                UNSUPPORTED_OPERATION_CUSTOM_SEQUENCE_MSG.format(operation_name="expected community cdf")
-            )
+        self._community_size_distribution("expected community cdf")
 
         return self._calc_expected_community_cdf()
 
     def _calc_expected_community_cdf(self) -> dict[int, float]:
-        self._params.beta = cast(float, self._params.beta)
-        self._params.min_community_size = cast(int, self._params.min_community_size)
-        self._params.max_community_size = cast(int, self._params.max_community_size)
-
-        cdf = {}
-        bottom = sum(
-            k ** (-self._params.beta)
-            for k in range(self._params.min_community_size, self._params.max_community_size + 1)
-        )
-        for s in range(self._params.min_community_size, self._params.max_community_size + 1):
-            cdf[s] = sum(k ** (-self._params.beta) for k in range(self._params.min_community_size, s + 1)) / bottom
-        return cdf
+        sizes, cdf = self.expected_community_cdf_arrays()
+        return dict(zip(sizes.tolist(), cdf.tolist()))
+
+    def expected_community_cdf_arrays(self) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        return powerlaw_cdf(*self._community_size_distribution("expected community cdf"))
 
     @property
-    def num_loops(self) -> int:
-        assert self.background_graph is not None
+    def diagnostics(self) -> dict[str, int]:
+        if self._diagnostics is None:
+            assert self.background_graph is not None
 
-        return (
-            sum(community.diagnostics["num_loops"] for community in self.communities)
-            + self.background_graph.diagnostics["num_loops"]
-        )
+            diagnostics = dict(self.background_graph.diagnostics)
+            diagnostics["num_community_edges"] = 0
+
+            for community in self.communities:
+                diagnostics["num_loops"] += community.diagnostics["num_loops"]
+                diagnostics["num_multi_edges"] += community.diagnostics["num_multi_edges"]
+                diagnostics["num_community_edges"] += community.num_generated_edges
+
+            self._diagnostics = diagnostics
+
+        return self._diagnostics
+
+    @property
+    def num_loops(self) -> int:
+        return self.diagnostics["num_loops"]
 
     @property
     def num_multi_edges(self) -> int:
-        assert self.background_graph is not None
+        return self.diagnostics["num_multi_edges"]
 
-        return (
-            sum(community.diagnostics["num_multi_edges"] for community in self.communities)
-            + self.background_graph.diagnostics["num_multi_edges"]
-        )
+    @property
+    def num_edges(self) -> int:
+        return self.edges_array.shape[0] if self._is_compact else len(self._adj_dict)
+
+    @property
+    def empirical_xi(self) -> float:
+        return 1 - (self.diagnostics["num_community_edges"] / self.num_edges)
 
     @property
     def xi_matrix(self) -> NDArray[np.float64]:
         if self._params.xi == 0:
             raise ValueError("xi_matrix only available if xi > 0")
 
-        return XiMatrixBuilder(self._params.xi, self.communities, self._adj_dict, self.deg_b).build()
+        return XiMatrixBuilder(self._params.xi, self.community_edge_counts(), self.community_stats).build()
+
+    @property
+    def sparse_xi_matrix(self) -> "SparseXiMatrix":
+        if self._params.xi == 0:
+            raise ValueError("sparse_xi_matrix only available if xi > 0")
+
+        return XiMatrixBuilder(self._params.xi, self.community_edge_counts(), self.community_stats).build_sparse()
+
+    def community_edge_counts(self) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+        if self._community_edge_counts is None:
+            self._community_edge_counts = count_community_pairs(
+                self.edges_array,
+                self.community_index,
+                len(self.communities),
+            )
+
+        return self._community_edge_counts
+
+    def degree_array(self) -> NDArray[np.int64]:
+        if self._degree_array is None:
+            self._degree_array = np.bincount(self.edges_array.ravel(), minlength=len(self.deg_b))
+            self._degree_array.flags.writeable = False
+
+        return self._degree_array
 
     @property
     def degree_sequence(self) -> dict[int, int]:
-        deg = {v: 0 for v in range(len(self.deg_b))}
-        for e in self.edges:
-            deg[e[0]] += 1
-            deg[e[1]] += 1
-        return deg
+        return dict(enumerate(self.degree_array().tolist()))
 
     @property
     def adj_dict(self) -> dict[Edge, int]:
+        if self._is_compact:
+            # A compact graph is simple, so every edge has multiplicity 1
+            return {Edge(v1, v2): 1 for v1, v2 in self.edges_array.tolist()}
+
         return self._adj_dict
 
     def to_adj_matrix(self) -> NDArray[np.bool_]:
+        edges = self.edges_array
+
         adj_matrix = np.zeros((len(self.deg_b), len(self.deg_b)), dtype=bool)
-        for edge in self._adj_dict:
-            adj_matrix[edge.v1, edge.v2] = True
-            adj_matrix[edge.v2, edge.v1] = True
+        adj_matrix[edges[:, 0], edges[:, 1]] = True
+        adj_matrix[edges[:, 1], edges[:, 0]] = True
 
         return adj_matrix
 
     @property
     def edges(self) -> list[tuple[int, int]]:
+        if self._is_compact:
+            return [(v1, v2) for v1, v2 in self.edges_array.tolist()]
+
         return [(edge.v1, edge.v2) for edge in self._adj_dict]
 
+    @property
+    def is_compact(self) -> bool:
+        return self._is_compact
+
+    @property
+    def edges_array(self) -> NDArray[np.signedinteger]:
+        if self._edges_array is None:
+            self._edges_array = np.fromiter(
+                chain.from_iterable((edge.v1, edge.v2) for edge in self._adj_dict),
+                dtype=vertex_dtype(len(self.deg_b)),
+                count=2 * len(self._adj_dict),
+            ).reshape(-1, 2)
+            self._edges_array.flags.writeable = False
+
+        return self._edges_array
+
     @property
     def is_proper_abcd(self) -> bool:
-        return len(build_recycle_list(self._adj_dict)) == 0
+        if self._is_proper_abcd is None:
+            return len(build_recycle_list(self._adj_dict)) == 0
+
+        return self._is_proper_abcd
 
     @property
     def num_communities(self) -> int:
         return len(self.communities) if self._params.num_outliers == 0 else len(self.communities) - 1
 
+    @property
+    def membership(self) -> NDArray[np.int32]:
+        if self._membership is None:
+            self._membership = np.repeat(self.community_ids, np.diff(self.community_offsets))
+            self._membership.flags.writeable = False
+
+        return self._membership
+
+    @property
+    def community_index(self) -> NDArray[np.int32]:
+        if self._community_index is None:
+            self._community_index = np.repeat(
+                np.arange(len(self.community_ids), dtype=np.int32),
+                np.diff(self.community_offsets),
+            )
+            self._community_index.flags.writeable = False
+
+        return self._community_index
+
     @property
     def membership_list(self) -> list[int]:
-        result = []
+        membership_list: list[int] = self.membership.tolist()
+        return membership_list
 
-        for community in self.communities:
-            result += [community.community_id] * len(community.vertices)
+    @overload
+    def community_of(self, vertex: int) -> int: ...
+
+    @overload
+    def community_of(self, vertex: NDArray[np.integer]) -> NDArray[np.int32]: ...
+
+    def community_of(self, vertex: Union[int, NDArray[np.integer]]) -> Union[int, NDArray[np.int32]]:
+        if isinstance(vertex, (int, np.integer)):
+            return int(self.membership[vertex])
+
+        communities: NDArray[np.int32] = self.membership[vertex]
+        return communities
+
+    def _set_community_offsets(self, offsets: NDArray[np.int64]) -> None:
+        self.community_offsets = offsets
+        self.community_ids = np.arange(len(offsets) - 1, dtype=np.int32)
+        if self._params.num_outliers > 0:
+            self.community_ids[-1] = OUTLIER_COMMUNITY_ID
+
+    def build_communities(
+        self,
+        offsets: NDArray[np.int64],
+        model: Model,
+        budget: Optional[BuildBudget] = None,
+    ) -> "GraphImpl":
+        self._set_community_offsets(offsets)
 
-        return result
+        for community_id, start, stop in zip(self.community_ids.tolist(), offsets[:-1].tolist(), offsets[1:].tolist()):
+            if budget is not None:
+                budget.check("community_edges")
 
-    def build_communities(self, communities: dict[int, list[int]], model: Model) -> "GraphImpl":
-        for community_id, community_vertices in communities.items():
-            community_edges = model({v: self.deg_c[v] for v in community_vertices})
+            community_edges = model(dict(zip(range(start, stop), self.deg_c[start:stop].tolist())))
             community_obj = Community(
                 edges=[Edge(e[0], e[1]) for e in community_edges],
-                vertices=community_vertices,
+                vertices=range(start, stop),
                 deg_b=self.deg_b,
                 deg_c=self.deg_c,
                 community_id=community_id,
@@ -261,15 +417,97 @@ class GraphImpl(AbstractGraph):
 
             self.communities.append(community_obj)
 
+        self._invalidate_cache()
+
         return self
 
-    def build_background_edges(self, model: Model) -> "GraphImpl":
-        edges = [Edge(edge[0], edge[1]) for edge in model(self.deg_b)]
-        self.background_graph = BackgroundGraph(edges)
+    def build_background_edges(self, model: Model, order: Optional[NDArray[np.int64]] = None) -> "GraphImpl":
+        if order is None:
+            return self.restore_background_edges(model(dict(enumerate(self.deg_b.tolist()))))
+
+        return self.restore_background_edges(model(dict(zip(order.tolist(), self.deg_b[order].tolist()))))
+
+    def restore_background_edges(self, edges: NDArray[np.int64]) -> "GraphImpl":
+        self.background_graph = BackgroundGraph([Edge(edge[0], edge[1]) for edge in edges])
         self._adj_dict = self.background_graph.adj_dict
+        self._invalidate_cache()
 
         return self
 
+    def background_arrays(self) -> dict[str, NDArray[np.int64]]:
+        assert self.background_graph is not None
+        edges = np.array([(edge.v1, edge.v2) for edge in self.background_graph.edges], dtype=np.int64).reshape(-1, 2)
+
+        return {"background_edges": edges}
+
+    def community_arrays(self) -> dict[str, NDArray[np.integer]]:
+        # Communities are simple after rewiring, so their adjacency is fully described by its edges, in dict order
+        edges = np.array(
+            [(edge.v1, edge.v2) for community in self.communities for edge in community.adj_dict],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        edge_offsets = np.cumsum([0] + [len(community.adj_dict) for community in self.communities], dtype=np.int64)
+        counters = np.array(
+            [
+                (
+                    community.diagnostics["num_loops"],
+                    community.diagnostics["num_multi_edges"],
+                    community.num_generated_edges,
+                )
+                for community in self.communities
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+
+        return {
+            "community_edges": edges,
+            "community_edge_offsets": edge_offsets,
+            "community_counters": counters,
+            "community_deg_b": self.deg_b,
+            "community_deg_c": self.deg_c,
+        }
+
+    def restore_communities(
+        self,
+        offsets: NDArray[np.int64],
+        community_edges: NDArray[np.int64],
+        community_edge_offsets: NDArray[np.int64],
+        community_counters: NDArray[np.int64],
+    ) -> "GraphImpl":
+        self._set_community_offsets(offsets)
+
+        for index, (community_id, start, stop) in enumerate(
+            zip(self.community_ids.tolist(), offsets[:-1].tolist(), offsets[1:].tolist())
+        ):
+            community = Community(
+                edges=[],
+                vertices=range(start, stop),
+                deg_b=self.deg_b,
+                deg_c=self.deg_c,
+                community_id=community_id,
+            )
+            num_loops, num_multi_edges, num_generated_edges = community_counters[index].tolist()
+            community.restore_edges(
+                community_edges[community_edge_offsets[index] : community_edge_offsets[index + 1]],  # noqa: E203
+                num_loops=num_loops,
+                num_multi_edges=num_multi_edges,
+                num_generated_edges=num_generated_edges,
+            )
+            self.communities.append(community)
+
+        self._invalidate_cache()
+
+        return self
+
+    def to_arrays(self) -> dict[str, NDArray[np.integer]]:
+        return {
+            "edges": self.edges_array,
+            "deg_b": self.deg_b,
+            "deg_c": self.deg_c,
+            "community_offsets": self.community_offsets,
+            "community_ids": self.community_ids,
+        }
+
     def combine_edges(self) -> "GraphImpl":
         for community in self.communities:
             for edge, count in community.adj_dict.items():
@@ -278,18 +516,43 @@ class GraphImpl(AbstractGraph):
                 else:
                     self._adj_dict[edge] = count
 
+        self._invalidate_cache()
+
         return self
 
-    def rewire_graph(self) -> "GraphImpl":
+    def rewire_graph(self, budget: Optional[BuildBudget] = None) -> "GraphImpl":
         bad_edges = build_recycle_list(self._adj_dict)
 
         while len(bad_edges) > 0:
+            if budget is not None:
+                budget.check("rewiring", remaining_bad_edges=len(bad_edges))
+
             for edge in bad_edges:
                 other_edge = choose_other_edge(self._adj_dict, edge)
                 rewire_edge(self._adj_dict, edge, other_edge)
 
             bad_edges = build_recycle_list(self._adj_dict)
 
+        self._invalidate_cache()
+
+        return self
+
+    def compact(self) -> "GraphImpl":
+        if self._is_compact:
+            return self
+
+        # Everything derived from the build-time edge structures is computed before they are released
+        self.diagnostics
+        self.edges_array
+        self._is_proper_abcd = self.is_proper_abcd
+
+        for community in self.communities:
+            community.release_edges()
+
+        self.background_graph = None
+        self._adj_dict = {}
+        self._is_compact = True
+
         return self
 
 
@@ -297,68 +560,120 @@ class XiMatrixBuilder:
     def __init__(
         self,
         xi: float,
-        communities: list[Community],
-        adj_matrix: dict[Edge, int],
-        deg_b: dict[int, int],
+        community_edge_counts: tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]],
+        community_stats: CommunityStats,
     ) -> None:
         self.xi = xi
-        self.communities = communities
-        self._community_len = len(communities)
-        self.adj_matrix = adj_matrix
-        self.deg_b = deg_b
+        self._community_len = len(community_stats)
+        self.rows, self.cols, self.counts = community_edge_counts
 
-        self.location: dict[int, int] = {}
-        self.actual_betweenness_matrix = np.zeros((self._community_len, self._community_len))
-        self.expected_betweenness_matrix = np.zeros((self._community_len, self._community_len))
-        self.normalized_betweeness_matrix = np.zeros((self._community_len, self._community_len))
+        self._is_outlier = community_stats.is_outlier
+
+        # Volume times empirical xi of a community is just the sum of its background degrees
+        self.xi_volumes = community_stats.xi_volumes.astype(np.float64)
+        self.volumes = community_stats.volumes.astype(np.float64)
 
-    def _build_location(self) -> None:
-        for c in self.communities:
-            for v in c.vertices:
-                self.location[v] = c.community_id
+        # Dense C x C matrices are only allocated by `build`, `build_sparse` never materializes them
+        self.actual_betweenness_matrix: NDArray[np.float64] = np.empty((0, 0))
+        self.expected_betweenness_matrix: NDArray[np.float64] = np.empty((0, 0))
+        self.normalized_betweeness_matrix: NDArray[np.float64] = np.empty((0, 0))
 
     def _build_actual_matrix(self) -> None:
-        for edge in self.adj_matrix:
-            self.actual_betweenness_matrix[self.location[edge.v1]][self.location[edge.v2]] += 1
-            self.actual_betweenness_matrix[self.location[edge.v2]][self.location[edge.v1]] += 1
+        # Every edge is counted in both directions, so internal edges count twice on the diagonal
+        self.actual_betweenness_matrix = np.zeros((self._community_len, self._community_len))
+        self.actual_betweenness_matrix[self.rows, self.cols] += self.counts
+        self.actual_betweenness_matrix[self.cols, self.rows] += self.counts
 
     def _build_expectation_matrix(self) -> None:
-        # Pre-compute community volumes and empirical xi's before looping
-        vol = {c.community_id: sum(c.degree_sequence.values()) for c in self.communities}
-        empirical_xi = {c.community_id: c.empirical_xi for c in self.communities}
-        bottom = sum(self.deg_b.values()) - 1
-        for c_i in self.communities:
-            for c_j in self.communities:
-                if c_i.community_id == OUTLIER_COMMUNITY_ID:
-                    vol_i = float(vol[OUTLIER_COMMUNITY_ID])
-                else:
-                    vol_i = vol[c_i.community_id] * empirical_xi[c_i.community_id]
-                if c_j.community_id == OUTLIER_COMMUNITY_ID:
-                    vol_j = float(vol[OUTLIER_COMMUNITY_ID])
-                else:
-                    vol_j = vol[c_j.community_id] * empirical_xi[c_j.community_id]
-                top = vol_i * vol_j
+        bottom = self.xi_volumes.sum() - 1
 
-                self.expected_betweenness_matrix[c_i.community_id][c_j.community_id] = top / bottom
-                self.expected_betweenness_matrix[c_j.community_id][c_i.community_id] = top / bottom
+        self.expected_betweenness_matrix = np.outer(self.xi_volumes, self.xi_volumes) / bottom
 
     def _build_normalized_matrix(self) -> None:
-        for c_i in self.communities:
-            for c_j in self.communities:
-                if c_i == c_j and c_i.community_id != OUTLIER_COMMUNITY_ID:
-                    self.normalized_betweeness_matrix[c_i.community_id][c_j.community_id] = (1 - c_i.empirical_xi) / (
-                        1 - self.xi
-                    )
-                else:
-                    self.normalized_betweeness_matrix[c_i.community_id][c_j.community_id] = (
-                        self.actual_betweenness_matrix[c_i.community_id][c_j.community_id]
-                        / self.expected_betweenness_matrix[c_i.community_id][c_j.community_id]
-                    )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.normalized_betweeness_matrix = self.actual_betweenness_matrix / self.expected_betweenness_matrix
+            diagonal = (1 - self.xi_volumes / self.volumes) / (1 - self.xi)
+
+        regular = np.flatnonzero(~self._is_outlier)
+        self.normalized_betweeness_matrix[regular, regular] = diagonal[regular]
 
     def build(self) -> NDArray[np.float64]:
-        self._build_location()
         self._build_actual_matrix()
         self._build_expectation_matrix()
         self._build_normalized_matrix()
 
         return self.normalized_betweeness_matrix
+
+    def build_sparse(self) -> "SparseXiMatrix":
+        # Mirror the upper triangle, counting every edge in both directions like the dense matrix does
+        off_diagonal = self.rows != self.cols
+        rows = np.concatenate([self.rows, self.cols[off_diagonal]])
+        cols = np.concatenate([self.cols, self.rows[off_diagonal]])
+        counts = np.concatenate([np.where(off_diagonal, self.counts, 2 * self.counts), self.counts[off_diagonal]])
+
+        order = np.lexsort((cols, rows))
+
+        return SparseXiMatrix(
+            xi=self.xi,
+            rows=rows[order],
+            cols=cols[order],
+            counts=counts[order],
+            xi_volumes=self.xi_volumes,
+            volumes=self.volumes,
+            is_outlier=self._is_outlier,
+        )
+
+
+@dataclass
+class SparseXiMatrix:
+    xi: float
+    rows: NDArray[np.int64]
+    cols: NDArray[np.int64]
+    counts: NDArray[np.int64]
+    xi_volumes: NDArray[np.float64]
+    volumes: NDArray[np.float64]
+    is_outlier: NDArray[np.bool_]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.xi_volumes), len(self.xi_volumes)
+
+    @require("scipy")
+    def to_scipy(self) -> "coo_matrix":  # type: ignore[no-any-unimported]
+        from scipy.sparse import coo_matrix
+
+        return coo_matrix((self.counts, (self.rows, self.cols)), shape=self.shape)
+
+    def expected_block(self, start: int, stop: int) -> NDArray[np.float64]:
+        # Sum of all background degrees equals the sum of xi-weighted community volumes
+        bottom = self.xi_volumes.sum() - 1
+
+        expected: NDArray[np.float64] = np.outer(self.xi_volumes[start:stop], self.xi_volumes) / bottom
+        return expected
+
+    def actual_block(self, start: int, stop: int) -> NDArray[np.float64]:
+        # Entries are sorted by row, so a row range is a contiguous slice of them
+        first, last = np.searchsorted(self.rows, [start, stop])
+
+        actual = np.zeros((stop - start, self.shape[1]))
+        actual[self.rows[first:last] - start, self.cols[first:last]] = self.counts[first:last]
+        return actual
+
+    def normalized_block(self, start: int, stop: int) -> NDArray[np.float64]:
+        stop = min(stop, self.shape[0])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = self.actual_block(start, stop) / self.expected_block(start, stop)
+            diagonal = (1 - self.xi_volumes[start:stop] / self.volumes[start:stop]) / (1 - self.xi)
+
+        regular = np.flatnonzero(~self.is_outlier[start:stop])
+        normalized[regular, start + regular] = diagonal[regular]
+
+        return normalized
+
+    def iter_normalized_blocks(self, block_size: int) -> Iterator[tuple[int, NDArray[np.float64]]]:
+        if block_size < 1:
+            raise ValueError("block_size must be a positive integer")
+
+        for start in range(0, self.shape[0], block_size):
+            yield start, self.normalized_block(start, start + block_size)
@@ -25,20 +25,67 @@ __all__ = [
     "split_degrees",
     "build_community_sizes",
     "add_outliers",
+    "VertexSequences",
+    "BuildBudget",
 ]
 
-from typing import Any
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Protocol,
+)
 
 import numpy as np
 from numpy.typing import NDArray
 
-from abcd_graph.graph.core.constants import OUTLIER_COMMUNITY_ID
+from abcd_graph.graph.core.exceptions import BuildCancelledException
 from abcd_graph.graph.core.utils import (
     powerlaw_distribution,
     rand_round,
 )
 
 
+@dataclass(frozen=True)
+class VertexSequences:
+    # Output of the vertex-level phases, edges of any number of graphs can be generated from it
+    deg_b: NDArray[np.int32]
+    deg_c: NDArray[np.int32]
+    community_offsets: NDArray[np.int64]
+    # Order in which the background model receives the vertices - the degree assignment order, as in 0.4.x
+    background_order: Optional[NDArray[np.int64]] = None
+
+
+class CancelEvent(Protocol):
+    def is_set(self) -> bool: ...
+
+
+@dataclass(frozen=True)
+class BuildBudget:
+    # Checked between the build phases and between rewiring rounds, `deadline` is a `time.monotonic()` timestamp
+    deadline: Optional[float] = None
+    cancel_event: Optional[CancelEvent] = None
+    # Called with the name of every completed phase
+    progress: Optional[Callable[[str], Any]] = None
+
+    @classmethod
+    def from_timeout(cls, timeout: Optional[float], cancel_event: Optional[CancelEvent] = None) -> "BuildBudget":
+        return cls(None if timeout is None else time.monotonic() + timeout, cancel_event)
+
+    def check(self, phase: str, remaining_bad_edges: int = 0) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise BuildCancelledException("cancelled", phase, remaining_bad_edges)
+
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BuildCancelledException("timeout", phase, remaining_bad_edges)
+
+    def done(self, phase: str) -> None:
+        if self.progress is not None:
+            self.progress(phase)
+
+
 def build_degrees(n: int, gamma: float, min_degree: int, max_degree: int) -> NDArray[np.int64]:
     avail = np.arange(min_degree, max_degree + 1, dtype=float)
 
@@ -79,24 +126,22 @@ def build_community_sizes(n: int, beta: float, min_community_size: int, max_comm
     return np.sort(community_sizes)[::-1]
 
 
-def build_communities(community_sizes: NDArray[np.int64]) -> dict[int, list[int]]:
-    communities = {}
-    v_last = 0
-    for i, c in enumerate(community_sizes):
-        communities[i] = [v for v in range(v_last, v_last + c)]
-        v_last += c
-    return communities
+def build_communities(community_sizes: NDArray[np.int64]) -> NDArray[np.int64]:
+    # Communities are contiguous vertex ranges, community `i` spans `offsets[i]:offsets[i + 1]`
+    offsets: NDArray[np.int64] = np.zeros(len(community_sizes) + 1, dtype=np.int64)
+    np.cumsum(community_sizes, out=offsets[1:])
+    return offsets
 
 
 def assign_degrees(
     degrees: NDArray[np.int64],
-    communities: dict[int, list[int]],
+    offsets: NDArray[np.int64],
     community_sizes: NDArray[np.int64],
     xi: float,
 ) -> dict[int, Any]:
     phi = 1 - np.sum(community_sizes**2) / (len(degrees) ** 2)
     deg = {}
-    avail = communities[0][-1]
+    avail = int(offsets[1]) - 1
     already_chosen: set[int] = set()
 
     lock = 0
@@ -105,7 +150,7 @@ def assign_degrees(
     for i, d in enumerate(degrees):
         if lock_needs_update(d, d_previous, lock, len(community_sizes)):
             threshold = calculate_threshold(d, xi, float(phi))
-            lock, avail = update_lock(threshold, lock, avail, community_sizes, communities)
+            lock, avail = update_lock(threshold, lock, avail, community_sizes, offsets)
 
         d_previous = d
 
@@ -142,10 +187,10 @@ def update_lock(
     lock: int,
     avail: int,
     community_sizes: NDArray[np.int64],
-    communities: dict[int, list[int]],
+    offsets: NDArray[np.int64],
 ) -> tuple[int, int]:
     while community_sizes[lock] >= threshold:
-        avail = communities[lock][-1]
+        avail = int(offsets[lock + 1]) - 1
         lock += 1
         if lock == len(community_sizes):
             break
@@ -170,20 +215,28 @@ def assign_remaining_degrees(
 
 def split_degrees(
     degrees: dict[int, int],
-    communities: dict[int, list[int]],
+    offsets: NDArray[np.int64],
     xi: float,
-) -> tuple[dict[int, int], dict[int, int]]:
-    deg_c = {v: rand_round((1 - xi) * degrees[v]) for v in degrees}
-    for community in communities.values():
-        if sum(deg_c[v] for v in community) % 2 == 0:
-            continue
-
-        v_max = _get_v_max(deg_c, community)
+    vcount: Optional[int] = None,
+) -> tuple[NDArray[np.int32], NDArray[np.int32]]:
+    # Vectors span all `vcount` vertices so that `add_outliers` can fill the trailing outlier segment in place
+    regular_vertices = len(degrees)
+    degrees_array = np.zeros(regular_vertices, dtype=np.int32)
+    deg_c = np.zeros(regular_vertices if vcount is None else vcount, dtype=np.int32)
+    deg_b = np.zeros_like(deg_c)
+    for v, degree in degrees.items():
+        degrees_array[v] = degree
+        deg_c[v] = rand_round((1 - xi) * degree)
+
+    # Fixing the parity of one community never changes the sum of another one
+    odd_communities = np.flatnonzero(np.add.reduceat(deg_c[:regular_vertices], offsets[:-1]) % 2)
+    for community in odd_communities:
+        v_max = _get_v_max(deg_c, int(offsets[community]), int(offsets[community + 1]))
         deg_c[v_max] += 1
-        if deg_c[v_max] > degrees[v_max]:
+        if deg_c[v_max] > degrees_array[v_max]:
             deg_c[v_max] -= 2
 
-    deg_b = {v: (degrees[v] - deg_c[v]) for v in degrees}
+    np.subtract(degrees_array, deg_c[:regular_vertices], out=deg_b[:regular_vertices])
     return deg_c, deg_b
 
 
@@ -194,19 +247,20 @@ def add_outliers(
     gamma: float,
     min_degree: int,
     max_degree: int,
-    communities: dict[int, list[int]],
-    deg_b: dict[int, int],
-    deg_c: dict[int, int],
-) -> tuple[dict[int, list[int]], dict[int, int], dict[int, int]]:
+    offsets: NDArray[np.int64],
+    deg_b: NDArray[np.int32],
+    deg_c: NDArray[np.int32],
+) -> NDArray[np.int64]:
+    if len(deg_b) != vcount or len(deg_c) != vcount:
+        raise ValueError("Degree vectors must be preallocated for all vertices, see `split_degrees(..., vcount=...)`")
+
+    # Outliers only have background degrees, `deg_c` is already zero on their segment
     regular_vertices = vcount - num_outliers
-    outlier_degrees = build_degrees(num_outliers, gamma, min_degree, max_degree)
-    communities = communities | {OUTLIER_COMMUNITY_ID: list(range(regular_vertices, vcount))}
-    deg_b = deg_b | {regular_vertices + i: outlier_degrees[i] for i in range(num_outliers)}
-    deg_c = deg_c | {regular_vertices + i: 0 for i in range(num_outliers)}
+    deg_b[regular_vertices:] = build_degrees(num_outliers, gamma, min_degree, max_degree)
 
-    return communities, deg_b, deg_c
+    # The outlier community is the last segment
+    return np.append(offsets, vcount)
 
 
-def _get_v_max(deg_c: dict[int, int], community: list[int]) -> int:
-    deg_c_subset = {v: deg_c[v] for v in community}
-    return max(deg_c_subset, key=deg_c_subset.__getitem__)
+def _get_v_max(deg_c: NDArray[np.int32], start: int, stop: int) -> int:
+    return start + int(np.argmax(deg_c[start:stop]))
@@ -18,8 +18,29 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-__all__ = ["MalformedGraphException"]
+__all__ = ["MalformedGraphException", "BuildCancelledException"]
 
 
 class MalformedGraphException(Exception):
     pass
+
+
+class BuildCancelledException(Exception):
+    """Raised when a build runs past its time budget or its cancel event is set.
+
+    `reason` is either `"timeout"` or `"cancelled"`, `phase` is the build phase that was reached and
+    `remaining_bad_edges` the number of loops and multi-edges left when it was stopped during rewiring.
+    """
+
+    def __init__(self, reason: str, phase: str, remaining_bad_edges: int = 0) -> None:
+        # All fields are passed on so that the exception survives pickling, e.g. out of a worker process
+        super().__init__(reason, phase, remaining_bad_edges)
+        self.reason = reason
+        self.phase = phase
+        self.remaining_bad_edges = remaining_bad_edges
+
+    def __str__(self) -> str:
+        message = f"Build {'timed out' if self.reason == 'timeout' else 'was cancelled'} in the {self.phase} phase"
+        if self.remaining_bad_edges:
+            message += f" with {self.remaining_bad_edges} bad edges left"
+        return message
@@ -18,11 +18,24 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-__all__ = ["rand_round", "powerlaw_distribution", "get_community_color_map"]
+__all__ = [
+    "rand_round",
+    "powerlaw_distribution",
+    "powerlaw_cdf",
+    "powerlaw_mean",
+    "empirical_cdf",
+    "vertex_dtype",
+    "stratified_sample",
+    "get_community_color_map",
+]
 
 import math
 import random
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+)
 
 import numpy as np
 from numpy.typing import NDArray
@@ -41,6 +54,59 @@ def powerlaw_distribution(choices: NDArray[np.float64], intensity: float) -> NDA
     return dist
 
 
+@lru_cache(maxsize=128)
+def powerlaw_cdf(intensity: float, min_value: int, max_value: int) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+    support = np.arange(min_value, max_value + 1, dtype=np.int64)
+    weights = support.astype(np.float64) ** (-intensity)
+
+    cdf: NDArray[np.float64] = np.cumsum(weights) / weights.sum()
+
+    # Results are shared between callers through the cache
+    support.flags.writeable = False
+    cdf.flags.writeable = False
+
+    return support, cdf
+
+
+@lru_cache(maxsize=128)
+def powerlaw_mean(intensity: float, min_value: int, max_value: int) -> float:
+    support = np.arange(min_value, max_value + 1, dtype=np.float64)
+    weights = support ** (-intensity)
+
+    return float(np.dot(support, weights) / weights.sum())
+
+
+def empirical_cdf(
+    values: NDArray[np.integer], bins: Optional[int] = None
+) -> tuple[NDArray[np.number], NDArray[np.float64]]:
+    if bins is None:
+        support, counts = np.unique(values, return_counts=True)
+    else:
+        counts, bin_edges = np.histogram(values, bins=bins)
+        support = bin_edges[1:]
+
+    cdf: NDArray[np.float64] = np.cumsum(counts) / len(values)
+    return support, cdf
+
+
+def vertex_dtype(vcount: int) -> "np.dtype[np.signedinteger]":
+    return np.dtype(np.int32) if vcount <= np.iinfo(np.int32).max else np.dtype(np.int64)
+
+
+def stratified_sample(offsets: NDArray[np.int64], sample_size: int) -> NDArray[np.int64]:
+    sizes = np.diff(offsets)
+    sample_size = min(sample_size, int(sizes.sum()))
+
+    # Largest remainder apportionment of the sample between communities, proportional to their sizes
+    shares = sizes * sample_size / sizes.sum()
+    quotas = np.floor(shares).astype(np.int64)
+    remainder = sample_size - int(quotas.sum())
+    quotas[np.argsort(quotas - shares)[:remainder]] += 1
+
+    sampled = [offsets[i] + np.random.choice(sizes[i], size=quotas[i], replace=False) for i in np.flatnonzero(quotas)]
+    return np.sort(np.concatenate(sampled)) if sampled else np.empty(0, dtype=np.int64)
+
+
 def get_community_color_map(communities: list["Community"]) -> list[str]:
     import matplotlib.colors as colors  # type: ignore[import]
 
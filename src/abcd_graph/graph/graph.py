@@ -20,24 +20,57 @@
 
 __all__ = ["ABCDGraph"]
 
+import asyncio
+import multiprocessing
+import threading
 import time
 import warnings
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+from contextlib import nullcontext
 from datetime import datetime
+from functools import partial
+from multiprocessing.managers import SyncManager
+from os import PathLike
+from pathlib import Path
+from queue import Queue
 from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Literal,
     Optional,
+    Sequence,
+    Union,
     cast,
+    overload,
 )
 
 import numpy as np
+from numpy.typing import NDArray
+from typing_extensions import TypeAlias
 
+from abcd_graph.cache import GraphCache
 from abcd_graph.callbacks.abstract import (
     ABCDCallback,
     BuildContext,
 )
+from abcd_graph.checkpoint import (
+    Checkpoint,
+    run_phase,
+)
 from abcd_graph.exporter import GraphExporter
-from abcd_graph.graph.community import ABCDCommunity
+from abcd_graph.graph.community import (
+    ABCDCommunities,
+    ABCDCommunity,
+)
 from abcd_graph.graph.core.abcd_objects import GraphImpl
 from abcd_graph.graph.core.build import (
+    BuildBudget,
+    CancelEvent,
+    VertexSequences,
     add_outliers,
     assign_degrees,
     build_communities,
@@ -48,9 +81,22 @@ from abcd_graph.graph.core.build import (
 from abcd_graph.logger import construct_logger
 from abcd_graph.models import (
     Model,
+    chung_lu,
     configuration_model,
 )
 from abcd_graph.params import ABCDParams
+from abcd_graph.shared import (
+    SharedGraphDescriptor,
+    attach,
+    share,
+)
+from abcd_graph.utils import seed as seed_all
+from abcd_graph.utils import seeded
+
+Retain: TypeAlias = Literal["full", "minimal"]
+
+# Cached under their names, other models need an explicit `model_key`
+_BUILTIN_MODELS = (configuration_model, chung_lu)
 
 
 class ABCDGraph:
@@ -78,8 +124,11 @@ class ABCDGraph:
         self._exporter: Optional[GraphExporter] = None
         self._callbacks = callbacks or []
 
+        self._communities: Optional[ABCDCommunities] = None
+
     def reset(self) -> None:
         self._graph = None
+        self._communities = None
 
     @property
     def is_built(self) -> bool:
@@ -105,34 +154,260 @@ class ABCDGraph:
     def edges(self) -> list[tuple[int, int]]:
         return self._graph.edges if self._graph else []
 
+    @property
+    def edges_array(self) -> NDArray[np.signedinteger]:
+        """Read-only `(m, 2)` view of the edge storage, shared with the graph and kept usable after `reset()`."""
+        return self._graph.edges_array if self._graph else np.empty((0, 2), dtype=np.int32)
+
     @property
     def membership_list(self) -> list[int]:
         return self._graph.membership_list if self._graph else []
 
     @property
-    def communities(self) -> list[ABCDCommunity]:
-        return (
-            [
-                ABCDCommunity(
-                    community_id=community.community_id,
-                    vertices=community.vertices,
-                    average_degree=community.average_degree,
-                    degree_sequence=community.degree_sequence,
-                    empirical_xi=community.empirical_xi,
-                )
-                for community in self._graph.communities
-            ]
-            if self._graph
-            else []
+    def membership(self) -> NDArray[np.int32]:
+        return self._graph.membership if self._graph else np.empty(0, dtype=np.int32)
+
+    @overload
+    def community_of(self, vertex: int) -> int: ...
+
+    @overload
+    def community_of(self, vertex: NDArray[np.integer]) -> NDArray[np.int32]: ...
+
+    def community_of(self, vertex: Union[int, NDArray[np.integer]]) -> Union[int, NDArray[np.int32]]:
+        if self._graph is None:
+            raise RuntimeError("Community lookup is not available if the graph has not been built.")
+
+        return self._graph.community_of(vertex)
+
+    @property
+    def communities(self) -> Sequence[ABCDCommunity]:
+        if self._graph is None:
+            return []
+
+        if self._communities is None:
+            self._communities = ABCDCommunities(self._graph.community_stats)
+
+        return self._communities
+
+    def compact(self) -> "ABCDGraph":
+        """Release the per-community and background edge structures kept from the build."""
+        if self._graph is None:
+            raise RuntimeError("Cannot compact a graph that has not been built.")
+
+        self._graph.compact()
+
+        return self
+
+    def to_shared_memory(self) -> SharedGraphDescriptor:
+        """Copy the graph arrays to shared memory, until `SharedGraphDescriptor.unlink()` is called."""
+        if self._graph is None:
+            raise RuntimeError("Cannot share a graph that has not been built.")
+
+        return share(self._graph, self.params)
+
+    @classmethod
+    def from_shared_memory(cls, descriptor: SharedGraphDescriptor) -> "ABCDGraph":
+        """Attach to a graph shared with `to_shared_memory` without copying it."""
+        graph = cls(descriptor.params)
+        arrays = attach(descriptor)
+
+        graph._graph = GraphImpl.from_arrays(
+            descriptor.params,
+            edges=arrays["edges"],
+            deg_b=arrays["deg_b"],
+            deg_c=arrays["deg_c"],
+            community_offsets=arrays["community_offsets"],
+            community_ids=arrays["community_ids"],
+            diagnostics=descriptor.diagnostics,
+            is_proper_abcd=descriptor.is_proper_abcd,
+            membership=arrays["membership"],
         )
+        graph._exporter = GraphExporter(graph._graph)
+
+        return graph
+
+    def detach(self) -> None:
+        """Drop a graph attached with `from_shared_memory`, keeping the arrays taken from it usable."""
+        self.reset()
+        self._exporter = None
+
+    def sample_sequences(self) -> VertexSequences:
+        """Run only the vertex-level phases, to be passed to `build(sequences=...)`."""
+        return self._build_sequences()
+
+    def build(
+        self,
+        model: Optional[Model] = None,
+        retain: Retain = "full",
+        sequences: Optional[VertexSequences] = None,
+        seed: Optional[int] = None,
+        cache_dir: Union[str, "PathLike[str]", GraphCache, None] = None,
+        model_key: Optional[str] = None,
+        checkpoint_dir: Union[str, "PathLike[str]", None] = None,
+        resume_from: Union[str, "PathLike[str]", None] = None,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[CancelEvent] = None,
+    ) -> "ABCDGraph":
+        self._check_build_args(retain, sequences)
+
+        if cache_dir is not None and (seed is None or sequences is not None):
+            raise ValueError("Building with `cache_dir` requires a `seed` and cannot be combined with `sequences`")
+
+        if cache_dir is not None and model is not None and model not in _BUILTIN_MODELS and model_key is None:
+            raise ValueError("Building a custom model with `cache_dir` requires a `model_key` identifying the model")
+
+        if checkpoint_dir is not None and resume_from is not None and Path(checkpoint_dir) != Path(resume_from):
+            raise ValueError("`checkpoint_dir` and `resume_from` must point to the same directory")
+
+        if (checkpoint_dir is not None or resume_from is not None) and sequences is not None:
+            raise ValueError("Checkpointing cannot be combined with `sequences`")
 
-    def build(self, model: Optional[Model] = None) -> "ABCDGraph":
         if self.is_built:
             warnings.warn("Graph has already been built. Run `reset` and try again.")
             return self
 
         model = model if model else configuration_model
+        context = self._before_build(model)
+
+        budget = None
+        if timeout is not None or cancel_event is not None:
+            budget = BuildBudget.from_timeout(timeout, cancel_event)
+
+        # A resumed build continues from the random state of its checkpoint, while other seeded builds restore the
+        # caller's state, which then does not depend on whether the graph was loaded from cache
+        random_state: ContextManager[None] = nullcontext()
+        if seed is not None and resume_from is not None:
+            seed_all(seed)
+        elif seed is not None:
+            random_state = seeded(seed)
+
+        cache, key = None, ""
+        if cache_dir is not None:
+            cache = cache_dir if isinstance(cache_dir, GraphCache) else GraphCache(cache_dir)
+            key = GraphCache.key(self.params, cast(int, seed), _cache_model_name(model, model_key))
+
+        with random_state:
+            try:
+                build_start = time.perf_counter()
+
+                self._graph = cache.load(key, self.params) if cache is not None else None
+                if self._graph is None:
+                    checkpoint = None
+                    if checkpoint_dir is not None or resume_from is not None:
+                        checkpoint = Checkpoint(
+                            cast(str, resume_from or checkpoint_dir),
+                            self.params,
+                            model.__name__,
+                            resume=resume_from is not None,
+                        )
+                        if checkpoint.completed:
+                            self.logger.info(f"Resuming the build after the {checkpoint.completed[-1]} phase")
+                        checkpoint.restore_random_state()
+
+                    build_end = self._build_impl(model, sequences, checkpoint, budget)
+                else:
+                    self.logger.info("Loaded the graph from cache")
+                    build_end = time.perf_counter()
+
+                context.end_time = datetime.now()
+            except Exception as e:
+                self.logger.error(f"An error occurred while building the graph: {e}")
+                self.reset()
+                raise e
 
+        context.raw_build_time = build_end - build_start
+
+        assert self._graph is not None
+
+        if retain == "minimal":
+            self._graph.compact()
+
+        if cache is not None and key not in cache:
+            cache.save(key, self._graph)
+
+        self._after_build(context)
+
+        return self
+
+    async def abuild(
+        self,
+        model: Optional[Model] = None,
+        retain: Retain = "full",
+        sequences: Optional[VertexSequences] = None,
+        executor: Optional[Executor] = None,
+        progress: Optional[Callable[[str], Any]] = None,
+    ) -> "ABCDGraph":
+        """Build the graph in `executor` without blocking the event loop, reporting completed phases to `progress`."""
+        self._check_build_args(retain, sequences)
+
+        if self.is_built:
+            warnings.warn("Graph has already been built. Run `reset` and try again.")
+            return self
+
+        model = model if model else configuration_model
+        context = self._before_build(model)
+
+        loop = asyncio.get_running_loop()
+
+        # Only the parameters and the logger are sent to the executor, never the callbacks
+        builder = ABCDGraph(self.params)
+        builder.logger = self.logger
+
+        cancel_event: threading.Event
+        report: Optional[Callable[[str], Any]] = None
+        phases: Optional[Queue[Optional[str]]] = None
+        forwarding: Optional[asyncio.Future[None]] = None
+
+        if isinstance(executor, ProcessPoolExecutor):
+            # Worker processes reach the event and the progress queue through a shared manager process
+            manager = await loop.run_in_executor(None, _process_manager)
+            cancel_event = manager.Event()
+            if progress is not None:
+                phases = manager.Queue()
+                report = phases.put
+                forwarding = asyncio.ensure_future(_forward_progress(loop, phases, progress))
+        else:
+            cancel_event = threading.Event()
+            if progress is not None:
+                report = partial(_report_threadsafe, loop, cancel_event, progress)
+
+        budget = BuildBudget(cancel_event=cancel_event, progress=report)
+
+        try:
+            build_start = time.perf_counter()
+
+            self._graph = await loop.run_in_executor(executor, _build_graph, builder, sequences, model, retain, budget)
+
+            if phases is not None and forwarding is not None:
+                phases.put(None)
+                await forwarding
+
+            context.end_time = datetime.now()
+        except (Exception, asyncio.CancelledError) as e:
+            # The build is stopped cooperatively, a running executor call cannot be interrupted
+            cancel_event.set()
+            if phases is not None and forwarding is not None:
+                phases.put(None)
+                forwarding.cancel()
+
+            self.logger.error(f"An error occurred while building the graph: {e!r}")
+            self.reset()
+            raise e
+
+        context.raw_build_time = time.perf_counter() - build_start
+
+        self._after_build(context)
+
+        return self
+
+    def _check_build_args(self, retain: Retain, sequences: Optional[VertexSequences]) -> None:
+        if retain not in ("full", "minimal"):
+            raise ValueError("retain must be either 'full' or 'minimal'")
+
+        if sequences is not None and len(sequences.deg_b) != self._vcount:
+            raise ValueError("sequences were sampled for a graph with a different number of vertices")
+
+    def _before_build(self, model: Model) -> BuildContext:
         context = BuildContext(
             model_used=model,
             start_time=datetime.now(),
@@ -143,86 +418,266 @@ class ABCDGraph:
         for callback in self._callbacks:
             callback.before_build(context)
 
-        try:
-            build_start = time.perf_counter()
-            build_end = self._build_impl(model)
-            context.end_time = datetime.now()
-        except Exception as e:
-            self.logger.error(f"An error occurred while building the graph: {e}")
-            self.reset()
-            raise e
-
-        context.raw_build_time = build_end - build_start
+        return context
 
+    def _after_build(self, context: BuildContext) -> None:
         assert self._graph is not None
         self._exporter = GraphExporter(self._graph)
 
         for callback in self._callbacks:
             callback.after_build(self._graph, context, self._exporter)
 
-        return self
+    def _build_impl(
+        self,
+        model: Model,
+        sequences: Optional[VertexSequences] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        budget: Optional[BuildBudget] = None,
+    ) -> float:
+        self._build_edges(sequences or self._build_sequences(checkpoint, budget), model, checkpoint, budget)
 
-    def _build_impl(self, model: Model) -> float:
-        degrees = (
-            build_degrees(
-                self._num_regular_vertices,
-                cast(float, self.params.gamma),
-                cast(int, self.params.min_degree),
-                cast(int, self.params.max_degree),
-            )
-            if self.params.degree_sequence is None
-            else np.array(self.params.degree_sequence)
-        )
+        return time.perf_counter()
 
-        self.logger.info("Building community sizes")
+    def _build_sequences(
+        self,
+        checkpoint: Optional[Checkpoint] = None,
+        budget: Optional[BuildBudget] = None,
+    ) -> VertexSequences:
+        budget = budget or BuildBudget()
+
+        budget.check("degrees")
+        degrees = run_phase(
+            checkpoint,
+            "degrees",
+            lambda: {
+                "degrees": (
+                    build_degrees(
+                        self._num_regular_vertices,
+                        cast(float, self.params.gamma),
+                        cast(int, self.params.min_degree),
+                        cast(int, self.params.max_degree),
+                    )
+                    if self.params.degree_sequence is None
+                    else np.array(self.params.degree_sequence)
+                )
+            },
+        )["degrees"]
+        budget.done("degrees")
 
-        community_sizes = (
-            build_community_sizes(
-                self._num_regular_vertices,
-                cast(float, self.params.beta),
-                cast(int, self.params.min_community_size),
-                cast(int, self.params.max_community_size),
-            )
-            if self.params.community_size_sequence is None
-            else np.array(self.params.community_size_sequence)
-        )
+        self.logger.info("Building community sizes")
+        budget.check("community_sizes")
+
+        community_sizes = run_phase(
+            checkpoint,
+            "community_sizes",
+            lambda: {
+                "community_sizes": (
+                    build_community_sizes(
+                        self._num_regular_vertices,
+                        cast(float, self.params.beta),
+                        cast(int, self.params.min_community_size),
+                        cast(int, self.params.max_community_size),
+                    )
+                    if self.params.community_size_sequence is None
+                    else np.array(self.params.community_size_sequence)
+                )
+            },
+        )["community_sizes"]
+        budget.done("community_sizes")
 
         self.logger.info("Building communities")
 
-        communities = build_communities(community_sizes)
+        community_offsets = build_communities(community_sizes)
 
         self.logger.info("Assigning degrees")
+        budget.check("assignment")
+
+        def assign() -> dict[str, NDArray[Any]]:
+            # The assignment order drives the random rounding in `split_degrees`, so it is kept as it is
+            deg = assign_degrees(degrees, community_offsets, community_sizes, self.params.xi)
+            return {
+                "vertices": np.fromiter(deg.keys(), dtype=np.int64, count=len(deg)),
+                "degrees": np.fromiter(deg.values(), dtype=np.int64, count=len(deg)),
+            }
 
-        deg = assign_degrees(degrees, communities, community_sizes, self.params.xi)
+        assignment = run_phase(checkpoint, "assignment", assign)
+        deg = dict(zip(assignment["vertices"].tolist(), assignment["degrees"].tolist()))
+        budget.done("assignment")
 
         self.logger.info("Splitting degrees")
+        budget.check("split")
 
-        deg_c, deg_b = split_degrees(deg, communities, self.params.xi)
+        def split() -> dict[str, NDArray[Any]]:
+            deg_c, deg_b = split_degrees(deg, community_offsets, self.params.xi, vcount=self._vcount)
+            return {"deg_b": deg_b, "deg_c": deg_c}
+
+        split_vectors = run_phase(checkpoint, "split", split)
+        deg_b, deg_c = split_vectors["deg_b"], split_vectors["deg_c"]
+        budget.done("split")
 
         if self._has_outliers:
             self.logger.info("Adding outliers")
-            communities, deg_b, deg_c = add_outliers(
-                vcount=self._vcount,
-                num_outliers=self.num_outliers,
-                gamma=cast(float, self.params.gamma),
-                min_degree=cast(int, self.params.min_degree),
-                max_degree=cast(int, self.params.max_degree),
-                communities=communities,
-                deg_b=deg_b,
-                deg_c=deg_c,
+            budget.check("outliers")
+
+            def outliers() -> dict[str, NDArray[Any]]:
+                offsets = add_outliers(
+                    vcount=self._vcount,
+                    num_outliers=self.num_outliers,
+                    gamma=cast(float, self.params.gamma),
+                    min_degree=cast(int, self.params.min_degree),
+                    max_degree=cast(int, self.params.max_degree),
+                    offsets=community_offsets,
+                    deg_b=deg_b,
+                    deg_c=deg_c,
+                )
+                return {"deg_b": deg_b, "deg_c": deg_c, "community_offsets": offsets}
+
+            with_outliers = run_phase(checkpoint, "outliers", outliers)
+            deg_b, deg_c = with_outliers["deg_b"], with_outliers["deg_c"]
+            community_offsets = with_outliers["community_offsets"]
+            budget.done("outliers")
+
+        # Outliers follow the regular vertices, in vertex order
+        background_order = np.concatenate(
+            [assignment["vertices"], np.arange(len(assignment["vertices"]), self._vcount, dtype=np.int64)]
+        )
+
+        return VertexSequences(
+            deg_b=deg_b,
+            deg_c=deg_c,
+            community_offsets=community_offsets,
+            background_order=background_order,
+        )
+
+    def _build_edges(
+        self,
+        sequences: VertexSequences,
+        model: Model,
+        checkpoint: Optional[Checkpoint] = None,
+        budget: Optional[BuildBudget] = None,
+    ) -> None:
+        budget = budget or BuildBudget()
+
+        if checkpoint is not None and checkpoint.is_completed("rewiring"):
+            self.logger.info("Restoring the finished graph from the checkpoint")
+            arrays, meta = checkpoint.arrays("rewiring"), checkpoint.meta("rewiring")
+            self._graph = GraphImpl.from_arrays(
+                self.params,
+                edges=arrays["edges"],
+                deg_b=arrays["deg_b"],
+                deg_c=arrays["deg_c"],
+                community_offsets=arrays["community_offsets"],
+                community_ids=arrays["community_ids"],
+                diagnostics=meta["diagnostics"],
+                is_proper_abcd=meta["is_proper_abcd"],
+            )
+            return
+
+        if checkpoint is not None and checkpoint.is_completed("community_edges"):
+            self.logger.info("Restoring community edges from the checkpoint")
+            communities = checkpoint.arrays("community_edges")
+            self._graph = GraphImpl(communities["community_deg_b"], communities["community_deg_c"], params=self.params)
+            self._graph.restore_communities(
+                sequences.community_offsets,
+                communities["community_edges"],
+                communities["community_edge_offsets"],
+                communities["community_counters"],
             )
+        else:
+            # Rewiring communities moves degree between `deg_c` and `deg_b`, so the shared sequences are left untouched
+            self._graph = GraphImpl(sequences.deg_b.copy(), sequences.deg_c.copy(), params=self.params)
+
+            self.logger.info("Building community edges")
+            self._graph.build_communities(sequences.community_offsets, model, budget)
 
-        self._graph = GraphImpl(deg_b, deg_c, params=self.params)
+            if checkpoint is not None:
+                checkpoint.save("community_edges", self._graph.community_arrays())
 
-        self.logger.info("Building community edges")
-        self._graph.build_communities(communities, model)
+        budget.done("community_edges")
 
-        self.logger.info("Building background edges")
-        self._graph.build_background_edges(model)
+        if checkpoint is not None and checkpoint.is_completed("background_edges"):
+            self.logger.info("Restoring background edges from the checkpoint")
+            self._graph.restore_background_edges(checkpoint.arrays("background_edges")["background_edges"])
+        else:
+            self.logger.info("Building background edges")
+            budget.check("background_edges")
+            self._graph.build_background_edges(model, sequences.background_order)
+
+            if checkpoint is not None:
+                checkpoint.save("background_edges", self._graph.background_arrays())
+
+        budget.done("background_edges")
 
         self.logger.info("Resolving collisions")
+        budget.check("rewiring")
         self._graph.combine_edges()
 
-        self._graph.rewire_graph()
+        self._graph.rewire_graph(budget)
 
-        return time.perf_counter()
+        if checkpoint is not None:
+            checkpoint.save(
+                "rewiring",
+                self._graph.to_arrays(),
+                meta={"diagnostics": self._graph.diagnostics, "is_proper_abcd": self._graph.is_proper_abcd},
+            )
+
+        budget.done("rewiring")
+
+
+def _cache_model_name(model: Model, model_key: Optional[str]) -> str:
+    # Custom models are namespaced, so they never share entries with the built-in models of the same name
+    return f"custom:{model_key}" if model_key is not None else model.__name__
+
+
+def _build_graph(
+    builder: ABCDGraph,
+    sequences: Optional[VertexSequences],
+    model: Model,
+    retain: Retain,
+    budget: BuildBudget,
+) -> GraphImpl:
+    builder._build_edges(sequences or builder._build_sequences(budget=budget), model, budget=budget)
+
+    assert builder._graph is not None
+    if retain == "minimal":
+        builder._graph.compact()
+
+    return builder._graph
+
+
+_manager: Optional[SyncManager] = None
+_manager_lock = threading.Lock()
+
+
+def _process_manager() -> SyncManager:
+    # Started on first use and shared by all asynchronous builds in process pools, it is shut down at exit
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = multiprocessing.Manager()
+
+        return _manager
+
+
+def _report_threadsafe(
+    loop: asyncio.AbstractEventLoop,
+    cancel_event: threading.Event,
+    progress: Callable[[str], Any],
+    phase: str,
+) -> None:
+    # After cancellation the loop may already be closed
+    if not cancel_event.is_set():
+        loop.call_soon_threadsafe(progress, phase)
+
+
+async def _forward_progress(
+    loop: asyncio.AbstractEventLoop,
+    phases: "Queue[Optional[str]]",
+    progress: Callable[[str], Any],
+) -> None:
+    while True:
+        phase = await loop.run_in_executor(None, phases.get)
+        if phase is None:
+            return
+
+        progress(phase)
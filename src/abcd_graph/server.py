@@ -0,0 +1,335 @@
+# Copyright (c) 2024 Jordan Barrett & Aleksander Wojnarowicz
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+__all__ = [
+    "GraphServer",
+    "ServerBusyError",
+    "MODELS",
+]
+
+import argparse
+import io
+import json
+import os
+import secrets
+import socketserver
+import threading
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+)
+from http import HTTPStatus
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+import numpy as np
+
+from abcd_graph.cache import GraphCache
+from abcd_graph.graph import ABCDGraph
+from abcd_graph.graph.core.exceptions import BuildCancelledException
+from abcd_graph.models import (
+    Model,
+    chung_lu,
+    configuration_model,
+)
+from abcd_graph.params import ABCDParams
+from abcd_graph.utils import seed as seed_all
+
+MODELS: dict[str, Model] = {
+    "configuration_model": configuration_model,
+    "chung_lu": chung_lu,
+}
+
+Address = Union[tuple[str, int], str]
+
+
+class ServerBusyError(Exception):
+    pass
+
+
+def _build_into_cache(
+    cache_dir: str,
+    key: str,
+    params: ABCDParams,
+    seed: int,
+    model_name: str,
+    timeout: Optional[float] = None,
+) -> str:
+    # Runs in a worker process - the graph is written to the cache and only its key is sent back
+    seed_all(seed)
+    graph = ABCDGraph(params).build(MODELS[model_name], retain="minimal", timeout=timeout)
+
+    assert graph._graph is not None
+    GraphCache(cache_dir).save(key, graph._graph)
+
+    return key
+
+
+class GraphServer:
+    """Local graph generation service.
+
+    Requests are built in a pool of worker processes and stored in a `GraphCache` under `cache_dir`, from which all
+    responses are served. Identical `(params, seed, model)` requests that are being built share one build, and at most
+    `max_queue` distinct builds are queued or running at a time - further requests are rejected as busy.
+
+    `address` is a `(host, port)` pair for HTTP over TCP, or a path for HTTP over a Unix socket. With `build_timeout`
+    builds that run longer than that many seconds are stopped and answered with `504 Gateway Timeout`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, "os.PathLike[str]"],
+        address: Address = ("127.0.0.1", 0),
+        workers: Optional[int] = None,
+        max_queue: int = 64,
+        build_timeout: Optional[float] = None,
+    ) -> None:
+        if max_queue < 1:
+            raise ValueError("max_queue must be a positive integer")
+
+        self.cache = GraphCache(cache_dir)
+        self.max_queue = max_queue
+        self.build_timeout = build_timeout
+
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._in_flight: dict[str, Future[str]] = {}
+        self._lock = threading.Lock()
+
+        self._httpd = _make_http_server(address, self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        address: Address = self._httpd.server_address  # type: ignore[assignment]
+        return address
+
+    def generate(
+        self,
+        params: ABCDParams,
+        seed: Optional[int] = None,
+        model: str = "configuration_model",
+    ) -> tuple[str, str, int]:
+        """Return the cache key of the requested graph, building it if needed, how it was obtained and its seed.
+
+        The status is `"hit"` if the graph was already cached, `"shared"` if an identical build was already running
+        and `"miss"` if it was built for this request. Without a `seed` a random one is picked.
+        """
+        if model not in MODELS:
+            raise ValueError(f"Unknown model '{model}', expected one of {sorted(MODELS)}")
+
+        seed = secrets.randbelow(2**32) if seed is None else seed
+        key = GraphCache.key(params, seed, model)
+
+        with self._lock:
+            if key in self.cache:
+                return key, "hit", seed
+
+            future = self._in_flight.get(key)
+            status = "shared"
+
+            if future is None:
+                if len(self._in_flight) >= self.max_queue:
+                    raise ServerBusyError("Too many graphs are being built, try again later")
+
+                future = self._executor.submit(
+                    _build_into_cache,
+                    str(self.cache.directory),
+                    key,
+                    params,
+                    seed,
+                    model,
+                    self.build_timeout,
+                )
+                self._in_flight[key] = future
+                status = "miss"
+
+        if status == "miss":
+            # Registered outside the lock - a callback of a future that is already done runs right away
+            future.add_done_callback(lambda _: self._forget(key))
+
+        return future.result(), status, seed
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def start(self) -> "GraphServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._httpd.server_close()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def __enter__(self) -> "GraphServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: "_HTTPServerMixin"  # type: ignore[assignment]
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        self._send(HTTPStatus.OK, b'{"status": "ok"}', "application/json")
+
+    def do_POST(self) -> None:
+        if self.path != "/graphs":
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not isinstance(body, dict) or not isinstance(body.get("params", {}), dict):
+                raise ValueError("The request body must be a JSON object with `params` being an object")
+
+            seed = body.get("seed")
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+                raise ValueError("`seed` must be a non-negative integer")
+
+            params = ABCDParams(**body.get("params", {}))
+            key, status, seed = self.server.graph_server.generate(
+                params,
+                seed=seed,
+                model=body.get("model", "configuration_model"),
+            )
+        except ServerBusyError as e:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+            return
+        except BuildCancelledException as e:
+            self._send_error(HTTPStatus.GATEWAY_TIMEOUT, str(e))
+            return
+        except (ValueError, TypeError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        except Exception as e:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Building the graph failed: {e!r}")
+            return
+
+        loaded = self.server.graph_server.cache.load_arrays(key)
+        assert loaded is not None
+
+        buffer = io.BytesIO()
+        np.savez(buffer, **loaded[0])  # type: ignore[arg-type]
+
+        headers = {"X-ABCD-Cache": status, "X-ABCD-Key": key, "X-ABCD-Seed": str(seed)}
+        self._send(HTTPStatus.OK, buffer.getvalue(), "application/octet-stream", headers)
+
+    def _send(
+        self,
+        code: HTTPStatus,
+        payload: bytes,
+        content_type: str,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, code: HTTPStatus, message: str) -> None:
+        self._send(code, json.dumps({"error": message}).encode(), "application/json")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _HTTPServerMixin:
+    graph_server: GraphServer
+
+
+class _TCPServer(_HTTPServerMixin, ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(_HTTPServerMixin, socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def _make_http_server(address: Address, graph_server: GraphServer) -> Union[_TCPServer, _UnixServer]:
+    httpd: Union[_TCPServer, _UnixServer]
+    if isinstance(address, str):
+        httpd = _UnixServer(address, _RequestHandler)
+    else:
+        httpd = _TCPServer(address, _RequestHandler)
+
+    httpd.graph_server = graph_server
+    return httpd
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local ABCD graph generation service")
+    parser.add_argument("--cache-dir", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix-socket", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--build-timeout", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    address: Address = args.unix_socket or (args.host, args.port)
+    server = GraphServer(
+        args.cache_dir,
+        address=address,
+        workers=args.workers,
+        max_queue=args.max_queue,
+        build_timeout=args.build_timeout,
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
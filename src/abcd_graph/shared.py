@@ -0,0 +1,149 @@
+# Copyright (c) 2024 Jordan Barrett & Aleksander Wojnarowicz
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+__all__ = ["SharedArray", "SharedGraphDescriptor"]
+
+import sys
+import threading
+import weakref
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from abcd_graph.graph.core.abcd_objects import GraphImpl
+from abcd_graph.params import ABCDParams
+
+# Segments created by this process are kept open until they are unlinked, as some platforms free them on close
+_owned_segments: dict[str, SharedMemory] = {}
+_attach_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    segment: str
+    dtype: str
+    shape: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SharedGraphDescriptor:
+    """Names and layouts of the shared memory segments holding a graph - small and picklable, to be sent to consumers.
+
+    The segments outlive every consumer and stay allocated until `unlink` is called, or at the latest until the
+    process that created them exits.
+    """
+
+    params: ABCDParams
+    arrays: dict[str, SharedArray]
+    diagnostics: dict[str, int]
+    is_proper_abcd: bool
+
+    def unlink(self) -> None:
+        """Free the segments. Graphs and arrays that are already attached keep working."""
+        for array in self.arrays.values():
+            segment = _owned_segments.pop(array.segment, None)
+            if segment is None:
+                try:
+                    segment = SharedMemory(name=array.segment)
+                except FileNotFoundError:
+                    continue
+
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                # Already unlinked through another copy of the descriptor
+                pass
+
+
+def share(graph: GraphImpl, params: ABCDParams) -> SharedGraphDescriptor:
+    arrays: dict[str, NDArray[Any]] = {**graph.to_arrays(), "membership": graph.membership}
+    shared: dict[str, SharedArray] = {}
+
+    try:
+        for name, array in arrays.items():
+            # Zero-sized segments are not allowed
+            segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+            _owned_segments[segment.name] = segment
+            shared[name] = SharedArray(segment=segment.name, dtype=array.dtype.str, shape=array.shape)
+
+            view = _view(segment, shared[name])
+            view[...] = array
+            del view
+    except BaseException:
+        SharedGraphDescriptor(params, shared, {}, False).unlink()
+        raise
+
+    return SharedGraphDescriptor(
+        params=params,
+        arrays=shared,
+        diagnostics=dict(graph.diagnostics),
+        is_proper_abcd=graph.is_proper_abcd,
+    )
+
+
+def attach(descriptor: SharedGraphDescriptor) -> dict[str, NDArray[Any]]:
+    arrays: dict[str, NDArray[Any]] = {}
+
+    try:
+        for name, array in descriptor.arrays.items():
+            segment = _attach(array.segment)
+            try:
+                arrays[name] = _view(segment, array)
+            except BaseException:
+                segment.close()
+                raise
+
+            arrays[name].flags.writeable = False
+            # Views of the array keep it alive, so the segment is closed only once nothing refers to its memory
+            weakref.finalize(arrays[name], segment.close).atexit = False
+    except BaseException:
+        arrays.clear()
+        raise
+
+    return arrays
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    # Before Python 3.13 attaching registers the segment with the resource tracker, which unlinks it when the tracker
+    # exits - consumers must not end the lifetime of segments they do not own (bpo-39959)
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = _skip_register  # type: ignore[assignment]
+        try:
+            return SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _skip_register(name: str, rtype: str) -> None:
+    pass
+
+
+def _view(segment: SharedMemory, array: SharedArray) -> NDArray[Any]:
+    return np.ndarray(array.shape, dtype=np.dtype(array.dtype), buffer=segment.buf)
@@ -20,8 +20,12 @@
 
 
 import random
+from contextlib import contextmanager
 from functools import wraps
-from typing import Callable
+from typing import (
+    Callable,
+    Iterator,
+)
 
 import numpy
 from typing_extensions import (
@@ -38,6 +42,18 @@ def seed(num: int) -> None:
     numpy.random.seed(num)
 
 
+@contextmanager
+def seeded(num: int) -> Iterator[None]:
+    # Seeds both generators for the duration of the block and restores their previous state afterwards
+    random_state, numpy_state = random.getstate(), numpy.random.get_state()
+    seed(num)
+    try:
+        yield
+    finally:
+        random.setstate(random_state)
+        numpy.random.set_state(numpy_state)
+
+
 def require(package_name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
     def deco(func: Callable[P, R]) -> Callable[P, R]:
         @wraps(func)
@@ -1,10 +1,34 @@
+import asyncio
+import hashlib
+import pickle
+import threading
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
-from abcd_graph import ABCDGraph
+from abcd_graph import (
+    ABCDGraph,
+    ABCDParams,
+)
+from abcd_graph.callbacks import StatsCollector
+from abcd_graph.graph.core.abcd_objects import GraphImpl
+from abcd_graph.graph.core.abcd_objects.community import Community
+from abcd_graph.graph.core.abcd_objects.edge import Edge
+from abcd_graph.graph.core.build import (
+    add_outliers,
+    build_communities,
+    build_community_sizes,
+    split_degrees,
+)
 from abcd_graph.graph.core.constants import OUTLIER_COMMUNITY_ID
+from abcd_graph.graph.core.exceptions import BuildCancelledException
 from abcd_graph.models import configuration_model
+from abcd_graph.utils import seed
 from tests.utils import (
     assert_graph_built,
     assert_graph_not_built,
@@ -63,7 +87,7 @@ def test_graph_build_error_triggers_reset(mock_reset, mock_build_impl):
     with pytest.raises(Exception):
         graph.build()
 
-    mock_build_impl.assert_called_once_with(configuration_model)
+    mock_build_impl.assert_called_once_with(configuration_model, None, None, None)
 
     mock_reset.assert_called_once()
 
@@ -90,3 +114,392 @@ def test_outliers_deg_c_is_zero_for_every_outlier(params_with_outliers):
     deg_c = g._graph.deg_c
 
     assert all(deg_c[v] == 0 for v in outlier_community.vertices)
+
+
+def test_degree_vectors(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    deg_b, deg_c = g._graph.deg_b, g._graph.deg_c
+
+    assert deg_b.dtype == deg_c.dtype == np.int32
+    assert len(deg_b) == len(deg_c) == g.vcount
+    assert np.array_equal(deg_b + deg_c, g._graph.degree_array())
+
+
+def test_community_offsets(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    offsets = g._graph.community_offsets
+
+    assert offsets[0] == 0 and offsets[-1] == g.vcount
+    assert g._graph.community_ids[-1] == OUTLIER_COMMUNITY_ID
+    for community, start, stop in zip(g._graph.communities, offsets[:-1], offsets[1:]):
+        assert community.vertices == range(start, stop)
+
+
+def test_membership(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    assert g.membership.dtype == np.int32
+    assert g.membership.tolist() == g.membership_list
+    assert g.membership is g.membership  # cached
+
+    with pytest.raises(ValueError):
+        g.membership[0] = 1
+
+
+def test_community_of(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    for community in g.communities:
+        assert g.community_of(community.vertices[0]) == community.community_id
+
+    vertices = np.arange(g.vcount)
+    np.testing.assert_array_equal(g.community_of(vertices), g.membership)
+
+
+def test_community_of_not_built(params):
+    with pytest.raises(RuntimeError):
+        ABCDGraph(params, logger=False).community_of(0)
+
+
+def test_degree_array(params):
+    g = ABCDGraph(params, logger=False).build()
+
+    degrees = g._graph.degree_array()
+
+    expected = np.zeros(g.vcount, dtype=np.int64)
+    for v1, v2 in g.edges:
+        expected[v1] += 1
+        expected[v2] += 1
+
+    np.testing.assert_array_equal(degrees, expected)
+    assert g._graph.degree_array() is degrees  # cached
+    assert g._graph.degree_sequence == dict(enumerate(expected.tolist()))
+
+
+def test_actual_degree_cdf_arrays(params):
+    g = ABCDGraph(params, logger=False).build()
+
+    degrees, cdf = g._graph.actual_degree_cdf_arrays()
+
+    assert np.all(np.diff(degrees) > 0)
+    assert np.all(np.diff(cdf) > 0)
+    assert cdf[-1] == pytest.approx(1)
+    assert g._graph.actual_degree_cdf == pytest.approx(dict(zip(degrees.tolist(), cdf.tolist())))
+
+    bin_edges, binned_cdf = g._graph.actual_degree_cdf_arrays(bins=4)
+
+    assert len(bin_edges) == len(binned_cdf) == 4
+    assert binned_cdf[-1] == pytest.approx(1)
+
+
+def test_actual_community_cdf_arrays(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    sizes, cdf = g._graph.actual_community_cdf_arrays()
+
+    regular_sizes = [len(c.vertices) for c in g.communities if c.community_id != OUTLIER_COMMUNITY_ID]
+
+    assert sizes.tolist() == sorted(set(regular_sizes))
+    assert cdf[0] == pytest.approx(regular_sizes.count(sizes[0]) / len(regular_sizes))
+    assert cdf[-1] == pytest.approx(1)
+
+
+def test_communities_are_lazy_views(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    communities = g.communities
+
+    assert g.communities is communities  # cached on the graph
+    assert len(communities) == len(g._graph.communities)
+    assert [c.community_id for c in communities[-2:]] == [c.community_id for c in g._graph.communities[-2:]]
+
+    for view, community in zip(communities, g._graph.communities):
+        assert view.community_id == community.community_id
+        assert list(view.vertices) == list(community.vertices)
+        assert view.degree_sequence == community.degree_sequence
+        assert view.average_degree == pytest.approx(community.average_degree)
+        assert view.empirical_xi == pytest.approx(community.empirical_xi)
+
+    with pytest.raises(IndexError):
+        _ = communities[len(communities)]
+
+
+def test_communities_views_dropped_on_reset(params):
+    g = ABCDGraph(params, logger=False).build()
+
+    communities = g.communities
+    g.reset()
+
+    assert g.communities == []
+
+    g.build()
+
+    assert g.communities is not communities
+
+
+def test_edges_array(params):
+    g = ABCDGraph(params, logger=False).build()
+
+    edges_array = g.edges_array
+
+    assert edges_array.shape == (len(g.edges), 2)
+    assert edges_array.dtype == np.int32
+    assert edges_array.tolist() == [list(edge) for edge in g.edges]
+    assert g.edges_array is edges_array  # no copy on access
+
+    with pytest.raises(ValueError):
+        edges_array[0, 0] = 0
+
+    g.reset()
+
+    assert g.edges_array.shape == (0, 2)
+    assert edges_array.shape == (len(edges_array), 2)  # detached array is still usable
+
+
+def test_build_retain_minimal(params_with_outliers):
+    seed(42)
+    full = ABCDGraph(params_with_outliers, logger=False).build()
+    seed(42)
+    minimal = ABCDGraph(params_with_outliers, logger=False).build(retain="minimal")
+
+    assert minimal._graph.is_compact
+    assert minimal._graph.background_graph is None
+    assert all(not community.edges and not community.adj_dict for community in minimal._graph.communities)
+
+    assert minimal.edges == full.edges
+    assert np.array_equal(minimal.edges_array, full.edges_array)
+    assert minimal._graph.diagnostics == full._graph.diagnostics
+    assert minimal._graph.num_edges == full._graph.num_edges
+    assert minimal._graph.adj_dict == full._graph.adj_dict
+    assert minimal.exporter.is_proper_abcd
+    assert np.array_equal(minimal.exporter.to_adjacency_matrix(), full.exporter.to_adjacency_matrix())
+
+
+def test_compact_after_build(params):
+    g = ABCDGraph(params, logger=False)
+
+    with pytest.raises(RuntimeError):
+        g.compact()
+
+    edges = g.build().edges
+    g.compact().compact()
+
+    assert g._graph.is_compact
+    assert g.edges == edges
+
+    with pytest.raises(RuntimeError):
+        g._graph.combine_edges()
+
+
+def test_build_invalid_retain(params):
+    with pytest.raises(ValueError):
+        ABCDGraph(params, logger=False).build(retain="nothing")
+
+
+def test_build_from_sampled_sequences(params_with_outliers):
+    sequences = ABCDGraph(params_with_outliers, logger=False).sample_sequences()
+    deg_b = sequences.deg_b.copy()
+
+    first = ABCDGraph(params_with_outliers, logger=False).build(sequences=sequences)
+    second = ABCDGraph(params_with_outliers, logger=False).build(sequences=sequences)
+
+    assert np.array_equal(sequences.deg_b, deg_b)
+    assert np.array_equal(first._graph.degree_array(), second._graph.degree_array())
+    assert np.array_equal(first.membership, second.membership)
+
+    with pytest.raises(ValueError):
+        ABCDGraph(ABCDParams(vcount=2000), logger=False).build(sequences=sequences)
+
+
+def test_abuild(params_with_outliers):
+    stats = StatsCollector()
+    phases = []
+    g = ABCDGraph(params_with_outliers, logger=False, callbacks=[stats])
+
+    asyncio.run(g.abuild(progress=phases.append))
+
+    assert g.is_built
+    assert phases == [
+        "degrees",
+        "community_sizes",
+        "assignment",
+        "split",
+        "outliers",
+        "community_edges",
+        "background_edges",
+        "rewiring",
+    ]
+    assert len(g.membership) == g.vcount
+    assert stats.statistics["number_of_edges"] == len(g.edges)
+
+
+def test_abuild_in_process_pool(params):
+    phases = []
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        g = asyncio.run(
+            ABCDGraph(params, logger=False).abuild(retain="minimal", executor=executor, progress=phases.append)
+        )
+
+    assert g.is_built
+    assert phases[0] == "degrees" and phases[-1] == "rewiring"
+    assert g._graph.is_compact
+    assert g.exporter.is_proper_abcd
+
+
+def test_abuild_cancelled(params):
+    g = ABCDGraph(params, logger=False)
+
+    async def cancel_build():
+        task = asyncio.ensure_future(g.abuild())
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_build())
+
+    assert not g.is_built
+
+
+def test_abuild_cancelled_stops_the_build_in_the_executor(params):
+    submitted = []
+    unblock = threading.Event()
+
+    def blocking_community_sizes(*args):
+        unblock.wait(10)
+        return build_community_sizes(*args)
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            submitted.append(super().submit(*args, **kwargs))
+            return submitted[-1]
+
+    async def cancel_build(executor):
+        task = asyncio.ensure_future(ABCDGraph(params, logger=False).abuild(executor=executor))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        unblock.set()
+
+    with patch("abcd_graph.graph.graph.build_community_sizes", blocking_community_sizes):
+        with RecordingExecutor(max_workers=1) as executor:
+            asyncio.run(cancel_build(executor))
+
+            exception = submitted[-1].exception(timeout=10)
+
+    assert isinstance(exception, BuildCancelledException)
+    assert (exception.reason, exception.phase) == ("cancelled", "assignment")
+
+
+def test_add_outliers_fills_degree_vectors_in_place():
+    offsets = build_communities(np.array([3, 2]))
+    deg_c, deg_b = split_degrees({v: 4 for v in range(5)}, offsets, xi=0.5, vcount=8)
+    deg_b_before = deg_b.copy()
+
+    offsets = add_outliers(
+        vcount=8,
+        num_outliers=3,
+        gamma=2.5,
+        min_degree=2,
+        max_degree=4,
+        offsets=offsets,
+        deg_b=deg_b,
+        deg_c=deg_c,
+    )
+
+    assert offsets.tolist() == [0, 3, 5, 8]
+    assert np.array_equal(deg_b[:5], deg_b_before[:5])
+    assert np.all(deg_b[5:] >= 2) and np.all(deg_c[5:] == 0)
+
+
+def test_add_outliers_requires_preallocated_degree_vectors():
+    offsets = build_communities(np.array([3, 2]))
+    deg_c, deg_b = split_degrees({v: 4 for v in range(5)}, offsets, xi=0.5)
+
+    with pytest.raises(ValueError):
+        add_outliers(
+            vcount=8,
+            num_outliers=3,
+            gamma=2.5,
+            min_degree=2,
+            max_degree=4,
+            offsets=offsets,
+            deg_b=deg_b,
+            deg_c=deg_c,
+        )
+
+
+def test_build_timeout(params):
+    g = ABCDGraph(params, logger=False)
+
+    with pytest.raises(BuildCancelledException) as exc_info:
+        g.build(timeout=0)
+
+    assert exc_info.value.reason == "timeout"
+    assert exc_info.value.phase == "degrees"
+    assert_graph_not_built(g)
+
+
+def test_build_cancelled_during_rewiring(params):
+    event = threading.Event()
+    combine_edges = GraphImpl.combine_edges
+
+    def combine_edges_and_cancel(self):
+        combine_edges(self)
+        # A loop guarantees at least one rewiring round
+        self._adj_dict[Edge(0, 0)] = 1
+        event.set()
+        return self
+
+    g = ABCDGraph(params, logger=False)
+
+    with patch.object(GraphImpl, "combine_edges", combine_edges_and_cancel):
+        with pytest.raises(BuildCancelledException) as exc_info:
+            g.build(cancel_event=event)
+
+    exception = exc_info.value
+    assert (exception.reason, exception.phase) == ("cancelled", "rewiring")
+    assert exception.remaining_bad_edges >= 1
+    assert_graph_not_built(g)
+
+    unpickled = pickle.loads(pickle.dumps(exception))
+    assert str(unpickled) == str(exception)
+    assert unpickled.remaining_bad_edges == exception.remaining_bad_edges
+
+
+def test_build_with_unset_cancel_event(params):
+    g = ABCDGraph(params, logger=False).build(cancel_event=threading.Event(), timeout=60)
+
+    assert_graph_built(g)
+
+
+def test_build_community_with_a_single_distinct_edge(params_with_custom_sequences):
+    # With this seed one community is left with a single multi-edge, which used to be rewired forever
+    g = ABCDGraph(params_with_custom_sequences, logger=False).build(seed=231)
+
+    assert_graph_built(g)
+
+
+def test_seeded_build_matches_previous_releases():
+    # Edges of this graph as generated by abcd-graph 0.4.x
+    seed(11)
+    g = ABCDGraph(ABCDParams(vcount=300, num_outliers=10)).build()
+
+    digest = hashlib.sha256(np.array(sorted(g.edges), dtype=np.int64).tobytes()).hexdigest()
+    assert digest == "49b7e23259f3f1b850a530dd29965dfc9bcfc07bf55c179aa5778e37b558329d"
+
+
+@pytest.mark.parametrize("edge", [Edge(0, 1), Edge(0, 0)])
+def test_rewire_community_with_single_distinct_edge(edge):
+    deg_b = np.zeros(2, dtype=np.int32)
+    deg_c = np.bincount([edge.v1, edge.v2] * 2, minlength=2).astype(np.int32)
+    community = Community(edges=[edge, edge], vertices=range(2), deg_b=deg_b, deg_c=deg_c, community_id=0)
+
+    community.rewire_community()
+
+    assert community.adj_dict == ({} if edge.is_loop else {edge: 1})
+    assert np.array_equal(deg_c, np.bincount([v for e in community.adj_dict for v in (e.v1, e.v2)], minlength=2))
+    assert deg_b.sum() + deg_c.sum() == 4
@@ -1,4 +1,9 @@
+import numpy as np
+import pytest
+
 from abcd_graph import ABCDGraph
+from abcd_graph.graph.core.abcd_objects.graph_impl import XiMatrixBuilder
+from abcd_graph.graph.core.constants import OUTLIER_COMMUNITY_ID
 
 
 def test_xi_matrix(params):
@@ -9,3 +14,59 @@ def test_xi_matrix(params):
     assert xi_matrix.min() >= 0
 
     assert xi_matrix.shape == (len(g.communities), len(g.communities))
+
+
+def test_xi_matrix_builder_actual_and_expected_matrices(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    builder = XiMatrixBuilder(g._graph._params.xi, g._graph.community_edge_counts(), g._graph.community_stats)
+    builder.build()
+
+    naive_actual = np.zeros_like(builder.actual_betweenness_matrix)
+    for v1, v2 in g.edges:
+        naive_actual[g.community_of(v1), g.community_of(v2)] += 1
+        naive_actual[g.community_of(v2), g.community_of(v1)] += 1
+
+    assert np.array_equal(builder.actual_betweenness_matrix, naive_actual)
+
+    expected = builder.expected_betweenness_matrix
+    assert np.allclose(expected, expected.T)
+
+    for community in g.communities:
+        if community.community_id == OUTLIER_COMMUNITY_ID:
+            continue
+
+        assert builder.normalized_betweeness_matrix[community.community_id, community.community_id] == pytest.approx(
+            (1 - community.empirical_xi) / (1 - g.params.xi)
+        )
+
+
+def test_sparse_xi_matrix_matches_dense(params_with_outliers):
+    g = ABCDGraph(params_with_outliers, logger=False).build()
+
+    xi_matrix = g._graph.xi_matrix
+    sparse_xi_matrix = g._graph.sparse_xi_matrix
+
+    assert sparse_xi_matrix.shape == xi_matrix.shape
+
+    blocks = list(sparse_xi_matrix.iter_normalized_blocks(block_size=4))
+
+    assert [start for start, _ in blocks] == list(range(0, xi_matrix.shape[0], 4))
+    np.testing.assert_allclose(np.vstack([block for _, block in blocks]), xi_matrix)
+
+
+@pytest.mark.integration
+def test_sparse_xi_matrix_to_scipy(params):
+    g = ABCDGraph(params, logger=False).build()
+
+    actual = g._graph.sparse_xi_matrix.to_scipy()
+
+    assert actual.shape == (len(g.communities), len(g.communities))
+    assert actual.sum() == 2 * len(g.edges)
+
+
+def test_sparse_xi_matrix_invalid_block_size(params):
+    g = ABCDGraph(params, logger=False).build()
+
+    with pytest.raises(ValueError):
+        next(g._graph.sparse_xi_matrix.iter_normalized_blocks(block_size=0))
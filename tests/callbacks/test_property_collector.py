@@ -1,3 +1,7 @@
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from unittest.mock import patch
 
 import pytest
@@ -15,8 +19,12 @@ def test_property_collector(params):
 
     assert len(props.degree_sequence) == params.vcount
 
+    assert props.degree_array.tolist() == list(props.degree_sequence.values())
+
     assert props.xi_matrix.shape == (len(graph.communities), len(graph.communities))
 
+    assert props.sparse_xi_matrix.shape == props.xi_matrix.shape
+
     assert min(props.actual_community_cdf.values()) >= 0 and round(max(props.actual_community_cdf.values()), 10) <= 1
 
     assert (
@@ -112,3 +120,66 @@ def test_property_collector_failing_methods_with_custom_sequences(params_with_cu
 
     with pytest.raises(RuntimeError):
         props.expected_community_cdf()
+
+
+def test_property_collector_background_computation(params):
+    props = PropertyCollector(background=True)
+    graph = ABCDGraph(params, callbacks=[props])
+
+    graph.build()
+
+    assert props.xi_matrix.shape == (len(graph.communities), len(graph.communities))
+    assert props.is_ready("xi_matrix")
+    assert props.degree_array.tolist() == list(props.degree_sequence.values())
+    assert round(max(props.actual_degree_cdf.values()), 10) == 1
+
+
+def test_property_collector_background_computation_with_custom_executor(params):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        props = PropertyCollector(background=True, executor=executor, properties=["degree_array"])
+        graph = ABCDGraph(params, callbacks=[props])
+
+        graph.build()
+
+        assert len(props.degree_array) == params.vcount
+        assert not props.is_ready("xi_matrix")  # not scheduled, computed only on access
+
+
+def test_property_collector_background_computation_reraises_errors(params_with_custom_sequences: ABCDParams):
+    props = PropertyCollector(background=True)
+    graph = ABCDGraph(params=params_with_custom_sequences, callbacks=[props])
+    graph.build()
+
+    with pytest.raises(RuntimeError):
+        _ = props.expected_degree_cdf
+
+    assert len(props.degree_array) == params_with_custom_sequences.vcount
+
+
+def test_property_collector_background_computation_in_process_pool(params):
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        props = PropertyCollector(background=True, executor=executor, properties=["degree_array", "xi_matrix"])
+        graph = ABCDGraph(params, callbacks=[props])
+
+        graph.build()
+
+        assert props.degree_array.tolist() == graph._graph.degree_array().tolist()
+        assert props.xi_matrix.shape == (len(graph.communities), len(graph.communities))
+
+
+def test_property_collector_unknown_property():
+    with pytest.raises(ValueError):
+        PropertyCollector(properties=["diameter"])
+
+
+@patch("abcd_graph.graph.core.abcd_objects.graph_impl.GraphImpl._calc_actual_community_cdf", return_value={})
+def test_property_collector_empty_result_is_not_recomputed(mock_actual_cdf):
+    props = PropertyCollector()
+    graph = ABCDGraph(callbacks=[props])
+
+    graph.build()
+
+    assert props.actual_community_cdf == {}
+    assert props.actual_community_cdf == {}
+
+    mock_actual_cdf.assert_called_once()
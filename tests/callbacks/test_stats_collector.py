@@ -41,3 +41,33 @@ def test_stats_collector_failing_methods_with_custom_sequences(params_with_custo
 
     with pytest.raises(RuntimeError):
         graph.build()
+
+
+def test_stats_collector_full_level_statistics(params):
+    stats = StatsCollector()
+    graph = ABCDGraph(params, callbacks=[stats]).build()
+
+    assert stats.fetch_statistic("number_of_edges") == len(graph.edges)
+    assert stats.fetch_statistic("actual_average_degree") == pytest.approx(
+        sum(sum(c.degree_sequence.values()) for c in graph.communities) / params.vcount
+    )
+    assert stats.fetch_statistic("number_of_loops") == graph._graph.num_loops
+    assert 0 <= stats.fetch_statistic("empirical_xi") <= 1
+    assert stats.fetch_statistic("time_to_collect_statistics") >= 0
+
+
+def test_stats_collector_basic_level_skips_expensive_statistics(params_with_custom_sequences: ABCDParams):
+    stats = StatsCollector(level="basic")
+    graph = ABCDGraph(params=params_with_custom_sequences, callbacks=[stats])
+
+    graph.build()
+
+    assert "number_of_edges" in stats.statistics
+    assert "time_to_collect_statistics" in stats.statistics
+    assert "expected_average_degree" not in stats.statistics
+    assert "actual_average_community_size" not in stats.statistics
+
+
+def test_stats_collector_invalid_level():
+    with pytest.raises(ValueError):
+        StatsCollector(level="everything")
@@ -64,3 +64,39 @@ def test_visualizer_draw_degree_cdf(mock_show):
     visualizer.draw_degree_cdf()
 
     mock_show.assert_called_once()
+
+
+@patch("matplotlib.pyplot.show")
+def test_visualizer_draw_degree_cdf_with_bins(mock_show):
+    visualizer = Visualizer()
+    graph = ABCDGraph(params=ABCDParams(vcount=60, max_community_size=50), callbacks=[visualizer])
+
+    graph.build()
+
+    visualizer.draw_degree_cdf(bins=10)
+
+    mock_show.assert_called_once()
+
+
+@patch("matplotlib.pyplot.show")
+def test_visualizer_draw_communities_with_sample(mock_show):
+    visualizer = Visualizer()
+    graph = ABCDGraph(params=ABCDParams(vcount=1000), callbacks=[visualizer])
+
+    graph.build()
+
+    visualizer.draw_communities(sample_size=50)
+
+    mock_show.assert_called_once()
+
+
+@patch("matplotlib.pyplot.show")
+def test_visualizer_draw_community_graph(mock_show):
+    visualizer = Visualizer()
+    graph = ABCDGraph(params=ABCDParams(vcount=1000, num_outliers=10), callbacks=[visualizer])
+
+    graph.build()
+
+    visualizer.draw_community_graph(min_weight=2)
+
+    mock_show.assert_called_once()
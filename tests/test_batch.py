@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+import numpy as np
+import pytest
+
+from abcd_graph import (
+    ABCDGraph,
+    ABCDParams,
+    generate_many,
+)
+from abcd_graph.batch import (
+    NpzSink,
+    agenerate_ensemble,
+    generate_ensemble,
+)
+
+
+def edge_hash_sink(graph, index):
+    return index, hashlib.sha1(graph.edges_array.tobytes()).hexdigest()
+
+
+def degree_sink(graph, index):
+    return graph._graph.degree_array().tolist(), graph.membership.tolist(), graph.edges
+
+
+def test_generate_many_stats_sink():
+    params = [ABCDParams(vcount=300, xi=xi) for xi in (0.1, 0.2, 0.3)]
+
+    results = list(generate_many(params, workers=2))
+
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert all(result["number_of_nodes"] == 300 for result in results)
+    assert all(result["number_of_edges"] > 0 for result in results)
+
+
+def test_generate_many_is_reproducible_with_seed():
+    params = [ABCDParams(vcount=300)] * 3
+    expected = [edge_hash_sink(ABCDGraph(params[i]).build(seed=42 + i), i) for i in range(3)]
+
+    assert list(generate_many(params, workers=2, sink=edge_hash_sink, seed=42)) == expected
+
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        assert list(generate_many(params, sink=edge_hash_sink, seed=42, executor=executor)) == expected
+
+
+def test_generate_many_with_seed_requires_process_pool():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            generate_many([ABCDParams(vcount=300)], seed=42, executor=executor)
+
+
+def test_generate_many_with_executor_and_npz_sink(tmp_path):
+    params = [ABCDParams(vcount=300)] * 2
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        paths = list(generate_many(params, sink=NpzSink(tmp_path, dtype=np.int32), executor=executor))
+
+    assert paths == [str(tmp_path / "graph_0.npz"), str(tmp_path / "graph_1.npz")]
+    with np.load(paths[0]) as data:
+        assert data["edge_index"].dtype == np.int32
+        assert data["labels"].shape == (300,)
+
+
+def test_generate_ensemble_reuses_sequences():
+    results = list(generate_ensemble(ABCDParams(vcount=300, num_outliers=10), 3, workers=2, sink=degree_sink, seed=1))
+
+    degrees, membership, edges = zip(*results)
+    assert degrees[0] == degrees[1] == degrees[2]
+    assert membership[0] == membership[1] == membership[2]
+    assert edges[0] != edges[1]
+
+
+def test_generate_ensemble_with_seed_leaves_global_state():
+    np.random.seed(3)
+    expected = np.random.random()
+
+    np.random.seed(3)
+    first = list(generate_ensemble(ABCDParams(vcount=300), 2, workers=2, sink=degree_sink, seed=1))
+    assert np.random.random() == expected
+
+    second = list(generate_ensemble(ABCDParams(vcount=300), 2, workers=2, sink=degree_sink, seed=1))
+    assert first == second
+
+
+def test_generate_ensemble_with_seed_requires_process_pool():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            generate_ensemble(ABCDParams(vcount=300), 2, seed=1, executor=executor)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(generate_ensemble(ABCDParams(vcount=300), 2, sink=degree_sink, seed=1, executor=executor))
+
+    assert results == list(generate_ensemble(ABCDParams(vcount=300), 2, workers=2, sink=degree_sink, seed=1))
+
+
+def test_generate_ensemble_resample():
+    results = list(generate_ensemble(ABCDParams(vcount=300), 2, workers=2, sink=degree_sink, seed=1, resample=True))
+
+    assert results[0][0] != results[1][0]
+
+
+def test_generate_ensemble_invalid_replicates():
+    with pytest.raises(ValueError):
+        generate_ensemble(ABCDParams(vcount=300), 0)
+
+
+def test_agenerate_ensemble():
+    async def collect():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return [graph async for graph in agenerate_ensemble(ABCDParams(vcount=300), 3, executor=executor)]
+
+    graphs = asyncio.run(collect())
+
+    assert len(graphs) == 3
+    assert all(graph.is_built and graph._graph.is_compact for graph in graphs)
+    assert graphs[0].membership.tolist() == graphs[1].membership.tolist() == graphs[2].membership.tolist()
@@ -0,0 +1,100 @@
+from functools import partial
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from abcd_graph import (
+    ABCDGraph,
+    ABCDParams,
+)
+from abcd_graph.cache import GraphCache
+from abcd_graph.models import configuration_model
+
+
+def build_into(cache, seed, params=None):
+    return ABCDGraph(params or ABCDParams(vcount=300, num_outliers=10)).build(seed=seed, cache_dir=cache)
+
+
+def test_build_with_cache_dir(tmp_path):
+    built = build_into(tmp_path, seed=1)
+    assert not built._graph.is_compact
+    assert len(list(tmp_path.iterdir())) == 1
+
+    with patch("abcd_graph.graph.ABCDGraph._build_impl") as mock_build_impl:
+        loaded = build_into(tmp_path, seed=1)
+
+    mock_build_impl.assert_not_called()
+    assert loaded._graph.is_compact
+    assert isinstance(loaded.edges_array, np.memmap)
+    assert loaded.edges == built.edges
+    assert np.array_equal(loaded.membership, built.membership)
+    assert loaded._graph.diagnostics == built._graph.diagnostics
+    assert [c.degree_sequence for c in loaded.communities] == [c.degree_sequence for c in built.communities]
+    assert np.allclose(loaded._graph.xi_matrix, built._graph.xi_matrix, equal_nan=True)
+    assert loaded.exporter.is_proper_abcd
+
+
+def test_build_with_cache_dir_depends_on_seed_and_version(tmp_path):
+    build_into(tmp_path, seed=1)
+    build_into(tmp_path, seed=2)
+
+    with patch("abcd_graph.cache.__version__", "0.0.0"):
+        build_into(tmp_path, seed=1)
+
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_build_with_cache_dir_leaves_global_state(tmp_path):
+    splits = []
+    for _ in range(2):
+        np.random.seed(3)
+        graph = build_into(tmp_path, seed=42)
+        splits.append(graph.exporter.to_node_splits({"train": 0.5, "test": 0.5})["train"])
+
+    assert np.array_equal(splits[0], splits[1])
+
+
+def test_build_with_cache_dir_requires_seed(tmp_path):
+    with pytest.raises(ValueError):
+        ABCDGraph(ABCDParams(vcount=300)).build(cache_dir=tmp_path)
+
+
+def test_build_with_cache_dir_and_custom_model(tmp_path):
+    def model(degree_sequence):
+        return configuration_model(degree_sequence)
+
+    for custom in (model, partial(configuration_model)):
+        with pytest.raises(ValueError):
+            ABCDGraph(ABCDParams(vcount=300)).build(custom, seed=1, cache_dir=tmp_path)
+
+    ABCDGraph(ABCDParams(vcount=300)).build(seed=1, cache_dir=tmp_path)
+    ABCDGraph(ABCDParams(vcount=300)).build(model, seed=1, cache_dir=tmp_path, model_key="configuration_model")
+    ABCDGraph(ABCDParams(vcount=300)).build(model, seed=1, cache_dir=tmp_path, model_key="other")
+
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = GraphCache(tmp_path, max_entries=2)
+    params = ABCDParams(vcount=300)
+
+    build_into(cache, seed=1, params=params)
+    build_into(cache, seed=2, params=params)
+    assert cache.load(GraphCache.key(params, 1, "configuration_model"), params) is not None
+
+    build_into(cache, seed=3, params=params)
+
+    assert GraphCache.key(params, 1, "configuration_model") in cache
+    assert GraphCache.key(params, 2, "configuration_model") not in cache
+    assert GraphCache.key(params, 3, "configuration_model") in cache
+
+
+def test_cache_max_bytes_keeps_latest_entry(tmp_path):
+    cache = GraphCache(tmp_path, max_bytes=1)
+    params = ABCDParams(vcount=300)
+
+    build_into(cache, seed=1, params=params)
+    build_into(cache, seed=2, params=params)
+
+    assert [path.name for path in tmp_path.iterdir()] == [GraphCache.key(params, 2, "configuration_model")]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from abcd_graph import (
+    ABCDGraph,
+    ABCDParams,
+)
+from abcd_graph.checkpoint import (
+    PHASES,
+    Checkpoint,
+)
+
+PARAMS = ABCDParams(vcount=300, num_outliers=10)
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(monkeypatch, phase):
+    save = Checkpoint.save
+
+    def save_and_interrupt(self, name, *args, **kwargs):
+        save(self, name, *args, **kwargs)
+        if name == phase:
+            raise Interrupted
+
+    monkeypatch.setattr(Checkpoint, "save", save_and_interrupt)
+
+
+def test_build_with_checkpoint_dir(tmp_path):
+    graph = ABCDGraph(PARAMS).build(seed=3, checkpoint_dir=tmp_path)
+
+    assert {path.name for path in tmp_path.iterdir()} == {"manifest.json"} | {f"{phase}.npz" for phase in PHASES}
+    assert not graph._graph.is_compact
+
+
+@pytest.mark.parametrize("phase", PHASES)
+def test_resume_from_phase(tmp_path, monkeypatch, phase):
+    expected = ABCDGraph(PARAMS).build(seed=3)
+
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, phase)
+        with pytest.raises(Interrupted):
+            ABCDGraph(PARAMS).build(seed=3, checkpoint_dir=tmp_path)
+
+    resumed = ABCDGraph(PARAMS).build(resume_from=tmp_path)
+
+    assert np.array_equal(resumed.edges_array, expected.edges_array)
+    assert np.array_equal(resumed.membership, expected.membership)
+    assert resumed._graph.diagnostics == expected._graph.diagnostics
+    assert resumed.exporter.is_proper_abcd
+
+
+def test_resume_from_empty_directory_starts_a_checkpoint(tmp_path):
+    ABCDGraph(PARAMS).build(seed=3, resume_from=tmp_path)
+
+    assert Checkpoint(tmp_path, PARAMS, "configuration_model", resume=True).completed == list(PHASES)
+
+
+def test_resume_with_different_params(tmp_path):
+    ABCDGraph(PARAMS).build(seed=3, checkpoint_dir=tmp_path)
+
+    with pytest.raises(ValueError):
+        ABCDGraph(ABCDParams(vcount=300, num_outliers=20)).build(resume_from=tmp_path)
+
+
+def test_checkpoint_cannot_be_combined_with_sequences(tmp_path):
+    graph = ABCDGraph(PARAMS)
+
+    with pytest.raises(ValueError):
+        graph.build(sequences=graph.sample_sequences(), checkpoint_dir=tmp_path)
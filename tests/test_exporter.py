@@ -56,3 +56,87 @@ def test_export_to_networkx(graph):
     assert nx_graph.number_of_nodes() == graph.vcount
     assert nx_graph.number_of_edges() == len(graph.edges)
     # TODO: Check if the ground truth communities are exported correctly
+
+
+def test_export_to_edge_index(graph):
+    graph.build()
+
+    edge_index = graph.exporter.to_edge_index()
+
+    assert edge_index.shape == (2, 2 * len(graph.edges))
+    assert edge_index.dtype == numpy.int64
+    assert edge_index.flags.c_contiguous
+    assert set(zip(edge_index[0].tolist(), edge_index[1].tolist())) == set(graph.edges) | {
+        (v2, v1) for v1, v2 in graph.edges
+    }
+
+
+def test_export_to_edge_index_not_symmetric(graph):
+    graph.build()
+
+    edge_index = graph.exporter.to_edge_index(dtype=numpy.int32, symmetric=False)
+
+    assert edge_index.shape == (2, len(graph.edges))
+    assert edge_index.dtype == numpy.int32
+    assert list(zip(edge_index[0].tolist(), edge_index[1].tolist())) == graph.edges
+
+
+def test_export_to_labels(graph):
+    graph.build()
+
+    assert graph.exporter.to_labels().tolist() == graph.membership_list
+
+
+def test_export_to_node_splits(graph):
+    graph.build()
+
+    splits = graph.exporter.to_node_splits({"train": 0.6, "val": 0.2, "test": 0.2})
+
+    assert sum(len(index) for index in splits.values()) == graph.vcount
+    assert numpy.union1d(numpy.union1d(splits["train"], splits["val"]), splits["test"]).size == graph.vcount
+
+    with pytest.raises(ValueError):
+        graph.exporter.to_node_splits({"train": 0.8, "test": 0.3})
+
+
+def test_export_to_node_splits_with_seed(graph):
+    graph.build()
+
+    fractions = {"train": 0.5, "test": 0.5}
+    splits = graph.exporter.to_node_splits(fractions, seed=7)
+    same_seed = graph.exporter.to_node_splits(fractions, seed=numpy.random.default_rng(7))
+
+    for name in fractions:
+        numpy.testing.assert_array_equal(splits[name], same_seed[name])
+
+
+def test_export_to_npz(graph, tmp_path):
+    graph.build()
+
+    graph.exporter.to_npz(tmp_path / "graph.npz", splits={"train": 0.5, "test": 0.5})
+
+    with numpy.load(tmp_path / "graph.npz") as data:
+        assert set(data.files) == {"edge_index", "labels", "train_index", "test_index"}
+        numpy.testing.assert_array_equal(data["edge_index"], graph.exporter.to_edge_index())
+        numpy.testing.assert_array_equal(data["labels"], graph.exporter.to_labels())
+
+
+@pytest.mark.parametrize("sparse", [True, False])
+def test_export_to_community_graph(graph, sparse):
+    graph.build()
+
+    community_graph = graph.exporter.to_community_graph(sparse=sparse)
+
+    num_communities = len(graph.communities)
+    index = {community.community_id: i for i, community in enumerate(graph.communities)}
+    expected = numpy.zeros((num_communities, num_communities), dtype=numpy.int64)
+    for u, v in graph.edges:
+        expected[index[graph.membership_list[u]], index[graph.membership_list[v]]] += 1
+    expected = expected + expected.T - numpy.diag(expected.diagonal())
+
+    edge_counts = community_graph.edge_counts.toarray() if sparse else community_graph.edge_counts
+    assert scipy.sparse.isspmatrix_csr(community_graph.edge_counts) == sparse
+    assert numpy.array_equal(edge_counts, expected - numpy.diag(expected.diagonal()))
+    assert numpy.array_equal(community_graph.internal_edges, expected.diagonal())
+    assert community_graph.community_ids.tolist() == [community.community_id for community in graph.communities]
+    assert community_graph.volumes.sum() == 2 * len(graph.edges)
@@ -0,0 +1,155 @@
+import http.client
+import io
+import json
+import socket
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+
+import numpy as np
+import pytest
+
+from abcd_graph import ABCDParams
+from abcd_graph.server import (
+    GraphServer,
+    ServerBusyError,
+)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+def post_graph(connection, payload):
+    connection.request("POST", "/graphs", body=json.dumps(payload), headers={"Content-Type": "application/json"})
+    return connection.getresponse()
+
+
+@pytest.fixture
+def server(tmp_path):
+    with GraphServer(tmp_path / "cache", workers=2, max_queue=2) as graph_server:
+        yield graph_server
+
+
+def test_generate_is_cached(server):
+    params = ABCDParams(vcount=300)
+
+    key, status, seed = server.generate(params, seed=1)
+    assert (status, seed) == ("miss", 1)
+    assert key in server.cache
+
+    assert server.generate(params, seed=1) == (key, "hit", 1)
+    assert server.generate(params, seed=2)[0] != key
+
+
+def test_generate_deduplicates_in_flight_requests(server):
+    params = ABCDParams(vcount=2000)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: server.generate(params, seed=3), range(4)))
+
+    assert len({key for key, _, _ in results}) == 1
+    assert [status for _, status, _ in results].count("miss") == 1
+
+
+def test_generate_when_build_is_done_on_submission(server, monkeypatch):
+    def submit_and_run(fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    monkeypatch.setattr(server._executor, "submit", submit_and_run)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        key, status, _ = executor.submit(server.generate, ABCDParams(vcount=300), seed=4).result(timeout=30)
+
+    assert status == "miss"
+    assert key in server.cache
+    assert server._in_flight == {}
+
+
+def test_generate_rejects_when_queue_is_full(server):
+    server._in_flight = {"a": Future(), "b": Future()}
+
+    with pytest.raises(ServerBusyError):
+        server.generate(ABCDParams(vcount=300), seed=1)
+
+
+def test_generate_unknown_model(server):
+    with pytest.raises(ValueError):
+        server.generate(ABCDParams(vcount=300), seed=1, model="erdos_renyi")
+
+
+def test_http_endpoints(server):
+    host, port = server.address
+    connection = http.client.HTTPConnection(host, port)
+
+    response = post_graph(connection, {"params": {"vcount": 300, "xi": 0.3}, "seed": 7})
+    assert response.status == 200
+    assert response.getheader("X-ABCD-Cache") == "miss"
+
+    with np.load(io.BytesIO(response.read())) as data:
+        assert data["edges"].shape[1] == 2
+        assert data["community_offsets"][-1] == 300
+
+    response = post_graph(connection, {"params": {"vcount": 300, "xi": 0.3}, "seed": 7})
+    response.read()
+    assert response.getheader("X-ABCD-Cache") == "hit"
+    assert response.getheader("X-ABCD-Seed") == "7"
+
+    response = post_graph(connection, {"params": {"vcount": 300}})
+    response.read()
+    seed, key = int(response.getheader("X-ABCD-Seed")), response.getheader("X-ABCD-Key")
+    assert server.generate(ABCDParams(vcount=300), seed=seed) == (key, "hit", seed)
+
+    for body in ([], {"params": []}, {"params": {"vcount": 300}, "seed": "7"}):
+        response = post_graph(connection, body)
+        assert response.status == 400
+        response.read()
+
+    response = post_graph(connection, {"params": {"vcount": 300, "gamma": 5}})
+    assert response.status == 400
+    assert "gamma" in json.loads(response.read())["error"]
+
+    connection.request("GET", "/health")
+    response = connection.getresponse()
+    assert response.status == 200
+    response.read()
+
+    connection.request("GET", "/unknown")
+    response = connection.getresponse()
+    assert response.status == 404
+    response.read()
+
+    server._in_flight = {"a": Future(), "b": Future()}
+    response = post_graph(connection, {"params": {"vcount": 300}})
+    assert response.status == 503
+    response.read()
+
+
+def test_build_timeout(tmp_path):
+    with GraphServer(tmp_path / "cache", workers=1, build_timeout=0) as graph_server:
+        host, port = graph_server.address
+        response = post_graph(http.client.HTTPConnection(host, port), {"params": {"vcount": 300}, "seed": 1})
+
+        assert response.status == 504
+        assert "timed out" in json.loads(response.read())["error"]
+        assert len(graph_server.cache._entries()) == 0
+
+
+def test_unix_socket(tmp_path):
+    socket_path = str(tmp_path / "abcd.sock")
+
+    with GraphServer(tmp_path / "cache", address=socket_path, workers=1):
+        response = post_graph(UnixHTTPConnection(socket_path), {"params": {"vcount": 300}, "seed": 1})
+
+        assert response.status == 200
+        with np.load(io.BytesIO(response.read())) as data:
+            assert len(data["deg_b"]) == 300
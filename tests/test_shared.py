@@ -0,0 +1,92 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from abcd_graph import (
+    ABCDGraph,
+    ABCDParams,
+)
+
+
+@pytest.fixture
+def shared():
+    graph = ABCDGraph(ABCDParams(vcount=300, num_outliers=10)).build(seed=5)
+    descriptor = graph.to_shared_memory()
+
+    yield graph, descriptor
+
+    descriptor.unlink()
+
+
+def summarize(descriptor):
+    graph = ABCDGraph.from_shared_memory(descriptor)
+    summary = (int(graph.edges_array.sum()), int(graph.membership.sum()), graph.exporter.is_proper_abcd)
+    graph.detach()
+
+    return summary
+
+
+def test_from_shared_memory(shared):
+    graph, descriptor = shared
+    attached = ABCDGraph.from_shared_memory(descriptor)
+
+    assert attached._graph.is_compact
+    assert np.array_equal(attached.edges_array, graph.edges_array)
+    assert np.array_equal(attached.membership, graph.membership)
+    assert attached._graph.diagnostics == graph._graph.diagnostics
+    assert [c.degree_sequence for c in attached.communities] == [c.degree_sequence for c in graph.communities]
+
+    with pytest.raises(ValueError):
+        attached.edges_array[0, 0] = 1
+
+    attached.detach()
+    assert not attached.is_built
+
+
+def test_arrays_outlive_detach(shared):
+    graph, descriptor = shared
+    attached = ABCDGraph.from_shared_memory(descriptor)
+    edges, membership = attached.edges_array, attached.membership[10:]
+
+    attached.detach()
+    descriptor.unlink()
+
+    assert edges.sum() == graph.edges_array.sum()
+    assert np.array_equal(membership, graph.membership[10:])
+
+
+def test_shared_memory_descriptor_is_small(shared):
+    _, descriptor = shared
+
+    assert len(pickle.dumps(descriptor)) < 2048
+
+
+def test_from_shared_memory_in_process_pool(shared):
+    graph, descriptor = shared
+    expected = (int(graph.edges_array.sum()), int(graph.membership.sum()), True)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(summarize, [descriptor] * 4)) == [expected] * 4
+
+    # Consumers exiting does not free the segments
+    assert summarize(descriptor) == expected
+
+
+def test_unlink_keeps_attached_graphs(shared):
+    graph, descriptor = shared
+    attached = ABCDGraph.from_shared_memory(descriptor)
+
+    descriptor.unlink()
+
+    assert np.array_equal(attached.edges_array, graph.edges_array)
+    with pytest.raises(FileNotFoundError):
+        ABCDGraph.from_shared_memory(descriptor)
+
+    attached.detach()
+
+
+def test_to_shared_memory_requires_built_graph():
+    with pytest.raises(RuntimeError):
+        ABCDGraph(ABCDParams(vcount=300)).to_shared_memory()
@@ -1,7 +1,13 @@
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
+from abcd_graph.graph.core.utils import (
+    powerlaw_cdf,
+    powerlaw_mean,
+    stratified_sample,
+)
 from abcd_graph.utils import (
     require,
     seed,
@@ -26,3 +32,34 @@ def test_require():
 
     with pytest.raises(ImportError):
         func()
+
+
+def test_powerlaw_cdf():
+    support, cdf = powerlaw_cdf(2.5, 5, 30)
+
+    weights = [k**-2.5 for k in range(5, 31)]
+    expected = [sum(weights[: i + 1]) / sum(weights) for i in range(len(weights))]
+
+    assert support.tolist() == list(range(5, 31))
+    assert cdf.tolist() == pytest.approx(expected)
+    assert powerlaw_cdf(2.5, 5, 30)[1] is cdf  # memoized
+
+    with pytest.raises(ValueError):
+        cdf[0] = 0
+
+
+def test_powerlaw_mean():
+    weights = [k**-1.5 for k in range(20, 251)]
+    expected = sum(k * w for k, w in zip(range(20, 251), weights)) / sum(weights)
+
+    assert powerlaw_mean(1.5, 20, 250) == pytest.approx(expected)
+
+
+def test_stratified_sample():
+    offsets = np.array([0, 500, 800, 900, 1000])
+
+    sample = stratified_sample(offsets, 100)
+
+    assert len(sample) == len(np.unique(sample)) == 100
+    assert np.histogram(sample, bins=offsets)[0].tolist() == [50, 30, 10, 10]
+    assert len(stratified_sample(offsets, 5000)) == 1000